@@ -3,21 +3,42 @@ Ad Platform MVP - API Dependencies
 Directly calls Supabase Auth API (Raw HTTP) to validate tokens.
 """
 
+import hashlib
+import time
 import httpx
+import jwt
 from typing import Annotated, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from supabase.client import Client
 
+from app.cache.ttl import MISSING, TTLCache
 from app.core.config import settings
-from app.core.supabase import get_supabase_service
+from app.core.supabase import SupabaseService, get_supabase_service
 
 # Security scheme
 security = HTTPBearer(auto_error=False)
 
+# Users resolved by Supabase Auth, keyed on a digest of the bearer token.
+# A revoked token stays accepted for at most USER_CACHE_SECONDS, and never
+# past the token's own expiry.
+USER_CACHE_SECONDS = 60
+_user_cache = TTLCache(maxsize=8192, ttl=USER_CACHE_SECONDS)
+
+
+def _user_cache_ttl(token: str) -> float:
+    """Seconds the resolved user may be cached: capped at the token's exp."""
+    try:
+        # Supabase Auth has already verified the token; only exp is read here
+        exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+    except jwt.InvalidTokenError:
+        return 0
+    if not isinstance(exp, (int, float)):
+        return 0
+    return min(USER_CACHE_SECONDS, exp - time.time())
+
 
 # --- 1. SUPABASE CLIENT ---
-async def get_supabase() -> Client:
+async def get_supabase() -> SupabaseService:
     """Get Supabase service instance for DB queries."""
     return get_supabase_service()
 
@@ -37,6 +58,10 @@ async def get_current_user(
         )
 
     token = credentials.credentials
+    token_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached_user = _user_cache.get(token_key)
+    if cached_user is not MISSING:
+        return cached_user
     
     # Supabase Auth URL'i (Config'den küçük harfle okuyoruz)
     auth_url = f"{settings.supabase_url}/auth/v1/user"
@@ -65,13 +90,17 @@ async def get_current_user(
             if not user:
                  raise Exception("User object parsing failed")
 
-            return {
+            current_user = {
                 "id": user.get("id"),
                 "email": user.get("email"),
                 "role": user.get("role", "authenticated"),
                 # MVP için Org ID fallback
                 "org_id": user.get("user_metadata", {}).get("org_id", "11111111-1111-1111-1111-111111111111")
             }
+            ttl = _user_cache_ttl(token)
+            if ttl > 0:
+                _user_cache.set(token_key, current_user, ttl=ttl)
+            return current_user
 
     except HTTPException as he:
         raise he
@@ -109,4 +138,4 @@ CurrentUser = Annotated[dict, Depends(get_current_user)]
 CurrentUserId = Annotated[str, Depends(get_current_user_id)]
 CurrentOrgId = Annotated[str, Depends(get_org_id)]
 AdminUser = Annotated[dict, Depends(require_admin)]
-Supabase = Annotated[Client, Depends(get_supabase)]
\ No newline at end of file
+Supabase = Annotated[SupabaseService, Depends(get_supabase)]
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+Ad Platform MVP - API Responses
+
+Response helpers shared by the v1 routers.
+"""
+
+from fastapi import Response, status
+from pydantic import BaseModel
+
+
+def model_response(model: BaseModel, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Serialize a response model straight to JSON bytes.
+
+    Returning a Response skips FastAPI's re-validation of the model against
+    response_model and the intermediate dict; keep response_model on the
+    route so the OpenAPI schema still documents the body.
+    """
+    return Response(
+        content=model.model_dump_json(by_alias=True),
+        status_code=status_code,
+        media_type="application/json",
+    )
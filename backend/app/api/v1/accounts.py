@@ -9,6 +9,7 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, Query, status
 
 from app.api.deps import CurrentUser, CurrentOrgId, AdminUser, Supabase
+from app.cache import invalidate_org_accounts, invalidate_org_metrics
 from app.models.account import (
     ConnectedAccountResponse,
     ConnectedAccountList,
@@ -249,6 +250,9 @@ async def batch_import_accounts(
             failed_count += 1
             details.append({"id": acc_id, "status": "failed", "error": str(e)})
 
+    if imported_count:
+        invalidate_org_accounts(org_id)
+
     return {
         "success": True, 
         "imported_count": imported_count, 
@@ -376,6 +380,8 @@ async def disconnect_account(
     
     # Soft delete
     await supabase.deactivate_connected_account(account_id)
+    invalidate_org_accounts(org_id)
+    await invalidate_org_metrics(org_id)
     
     return None
 
@@ -442,6 +448,8 @@ async def trigger_sync(
     
     try:
         sync_result = await sync_account_metrics(account_id, date_from, date_to)
+        # Real and demo syncs both write daily_metrics
+        await invalidate_org_metrics(org_id)
         
         if sync_result.get("success"):
             await supabase.update_sync_job(job["id"], {
@@ -788,6 +796,9 @@ async def bulk_import_google_ads_accounts(
             ))
             failed_count += 1
 
+    if imported_count:
+        invalidate_org_accounts(org_id)
+
     return BulkImportResponse(
         success=imported_count > 0,
         imported_count=imported_count,
@@ -934,6 +945,8 @@ async def add_account_by_id(
             detail="Hesap kaydedilemedi",
         )
     
+    invalidate_org_accounts(org_id)
+    
     return AddAccountByIdResponse(
         success=True,
         account_id=request.account_id,
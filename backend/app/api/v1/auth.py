@@ -4,20 +4,24 @@ Ad Platform MVP - OAuth Authentication Endpoints
 OAuth flows for Google Ads and Meta Ads.
 """
 
+import logging
 import urllib.parse
+import uuid
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request, status
 from fastapi.responses import RedirectResponse
 import httpx
 
+from app.api.deps import Supabase
+from app.cache import invalidate_org_accounts
 from app.core.config import settings
+from app.core.supabase import SupabaseService, create_supabase_client
 from app.core.security import (
     create_oauth_state_token,
     decode_oauth_state_token,
     encrypt_token,
 )
-from app.core.supabase import get_supabase_service
 from app.models.account import (
     Platform,
     OAuthInitiateRequest,
@@ -28,9 +32,71 @@ from app.models.account import (
 )
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _connected_account_id(org_id: str, platform: str, platform_account_id: str) -> str:
+    """
+    Derive a stable ID for a new connected account from its natural key.
+
+    Only used when no row exists yet; reconnects keep the stored ID, since
+    rows created earlier have random uuid4 IDs.
+    """
+    return str(uuid.uuid5(
+        uuid.NAMESPACE_URL,
+        f"{org_id}:{platform}:{platform_account_id}",
+    ))
+
+
+async def _store_connected_account(
+    supabase: SupabaseService,
+    background_tasks: BackgroundTasks,
+    account_data: dict,
+    existing_id: Optional[str],
+) -> str:
+    """
+    Persist an OAuth account and return the ID the redirect should report.
+
+    A reconnect refreshes tokens on a row the user already sees, so it is
+    awaited and a failure surfaces as an error instead of a false success.
+    A new row is inserted in the background so the redirect is immediate.
+    """
+    if existing_id is not None:
+        try:
+            stored = await supabase.create_connected_account(account_data)
+        except Exception as e:
+            logger.error(
+                f"Failed to refresh {account_data['platform']} account {existing_id} "
+                f"for org {account_data['org_id']}: {e}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Hesap bilgileri güncellenemedi",
+            )
+        invalidate_org_accounts(account_data["org_id"])
+        return stored["id"]
+
+    background_tasks.add_task(_insert_connected_account, supabase, account_data)
+    return account_data["id"]
+
+
+async def _insert_connected_account(supabase: SupabaseService, account_data: dict) -> None:
+    """Background insert of a newly connected account, logged with context on failure."""
+    try:
+        await supabase.create_connected_account(account_data)
+    except Exception:
+        # No row exists to flag, so the log is the only record of the failure
+        logger.exception(
+            f"Failed to store new {account_data['platform']} account "
+            f"{account_data['id']} ({account_data['platform_account_id']}) "
+            f"for org {account_data['org_id']}"
+        )
+        return
+    invalidate_org_accounts(account_data["org_id"])
+
+
 # ===========================================
 # USER LOGIN
 # ===========================================
@@ -43,11 +109,10 @@ async def login(request: LoginRequest):
     Uses Supabase Auth. Returns JWT access token for API authorization.
     Use the returned access_token in the 'Authorize' button in Swagger UI.
     """
-    supabase = get_supabase_service()
-    
     try:
-        # Authenticate with Supabase Auth
-        auth_response = supabase.client.auth.sign_in_with_password({
+        # Authenticate with Supabase Auth on a throwaway client - signing in
+        # would switch the shared service_role client to this user's JWT
+        auth_response = create_supabase_client().auth.sign_in_with_password({
             "email": request.email,
             "password": request.password,
         })
@@ -99,6 +164,16 @@ GOOGLE_ADS_SCOPES = [
     "profile",
 ]
 
+# Static part of the authorization URL, built once at import time
+_GOOGLE_AUTH_PREFIX = GOOGLE_AUTH_URL + "?" + urllib.parse.urlencode({
+    "client_id": settings.google_ads_client_id,
+    "redirect_uri": settings.google_ads_redirect_uri,
+    "response_type": "code",
+    "scope": " ".join(GOOGLE_ADS_SCOPES),
+    "access_type": "offline",
+    "prompt": "consent",  # Force consent to get refresh token
+})
+
 
 @router.post("/google/initiate", response_model=OAuthInitiateResponse)
 async def initiate_google_oauth(
@@ -117,18 +192,8 @@ async def initiate_google_oauth(
         redirect_uri=request.redirect_uri,
     )
     
-    # Build authorization URL
-    params = {
-        "client_id": settings.google_ads_client_id,
-        "redirect_uri": settings.google_ads_redirect_uri,
-        "response_type": "code",
-        "scope": " ".join(GOOGLE_ADS_SCOPES),
-        "access_type": "offline",
-        "prompt": "consent",  # Force consent to get refresh token
-        "state": state,
-    }
-    
-    authorization_url = f"{GOOGLE_AUTH_URL}?{urllib.parse.urlencode(params)}"
+    # Build authorization URL (only state varies per request)
+    authorization_url = f"{_GOOGLE_AUTH_PREFIX}&state={urllib.parse.quote(state, safe='')}"
     
     return OAuthInitiateResponse(
         authorization_url=authorization_url,
@@ -160,18 +225,8 @@ async def authorize_google_oauth(
         redirect_uri=redirect_uri or "http://localhost:3000/accounts",
     )
     
-    # Build authorization URL
-    params = {
-        "client_id": settings.google_ads_client_id,
-        "redirect_uri": settings.google_ads_redirect_uri,
-        "response_type": "code",
-        "scope": " ".join(GOOGLE_ADS_SCOPES),
-        "access_type": "offline",
-        "prompt": "consent",
-        "state": state,
-    }
-    
-    authorization_url = f"{GOOGLE_AUTH_URL}?{urllib.parse.urlencode(params)}"
+    # Build authorization URL (only state varies per request)
+    authorization_url = f"{_GOOGLE_AUTH_PREFIX}&state={urllib.parse.quote(state, safe='')}"
     
     # Redirect user directly to Google
     return RedirectResponse(url=authorization_url)
@@ -216,6 +271,8 @@ async def fetch_google_ads_customer_ids(access_token: str) -> list[dict]:
 
 @router.get("/google/callback")
 async def google_oauth_callback(
+    background_tasks: BackgroundTasks,
+    supabase: Supabase,
     code: Optional[str] = None,
     state: Optional[str] = None,
     error: Optional[str] = None,
@@ -225,6 +282,8 @@ async def google_oauth_callback(
     Handle Google OAuth callback.
     
     Exchanges authorization code for tokens and stores the connected account.
+    A new account row is written in the background so the redirect is not
+    held up by the database insert; reconnects are written before redirecting.
     """
     # Check for errors
     if error:
@@ -297,7 +356,6 @@ async def google_oauth_callback(
     # For now, we'll create a placeholder account
     
     # Get user's org_id (with fallback for MVP)
-    supabase = get_supabase_service()
     user = await supabase.get_user(user_id)
     
     # MVP: If user not in users table, use default org_id
@@ -312,11 +370,22 @@ async def google_oauth_callback(
     # Store connected account
     from datetime import datetime, timedelta, timezone
     
+    platform_account_id = email or f"google_{user_id[:8]}"  # Temporary
+
+    # Reconnects keep the stored ID; new rows get theirs client-side so the
+    # redirect can reference it before the background insert has completed
+    existing_id = await supabase.get_connected_account_id(
+        org_id, Platform.GOOGLE_ADS.value, platform_account_id
+    )
+    account_id = existing_id or _connected_account_id(
+        org_id, Platform.GOOGLE_ADS.value, platform_account_id
+    )
+
     account_data = {
         "org_id": org_id,
         "connected_by": user_id,
         "platform": Platform.GOOGLE_ADS.value,
-        "platform_account_id": email or f"google_{user_id[:8]}",  # Temporary
+        "platform_account_id": platform_account_id,
         "platform_account_name": email or "Google Ads Account",
         "access_token_encrypted": encrypt_token(access_token),
         "refresh_token_encrypted": encrypt_token(refresh_token) if refresh_token else None,
@@ -326,25 +395,23 @@ async def google_oauth_callback(
         "status": "active",
         "is_active": True,  # Required for RLS policy
     }
+    if existing_id is None:
+        account_data["id"] = account_id
     
-    try:
-        account = await supabase.create_connected_account(account_data)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to save account: {str(e)}",
-        )
+    account_id = await _store_connected_account(
+        supabase, background_tasks, account_data, existing_id
+    )
     
     # Redirect or return response
     if redirect_uri:
         return RedirectResponse(
-            url=f"{redirect_uri}?success=true&account_id={account['id']}"
+            url=f"{redirect_uri}?success=true&account_id={account_id}"
         )
     
     return OAuthCallbackResponse(
         success=True,
-        account_id=account["id"],
-        account_name=account["platform_account_name"],
+        account_id=account_id,
+        account_name=account_data["platform_account_name"],
         platform=Platform.GOOGLE_ADS,
         message="Google Ads hesabı başarıyla bağlandı",
         redirect_uri=redirect_uri,
@@ -364,6 +431,14 @@ META_SCOPES = [
     "email",
 ]
 
+# Static part of the authorization URL, built once at import time
+_META_AUTH_PREFIX = META_AUTH_URL + "?" + urllib.parse.urlencode({
+    "client_id": settings.meta_app_id,
+    "redirect_uri": settings.meta_redirect_uri,
+    "response_type": "code",
+    "scope": ",".join(META_SCOPES),
+})
+
 
 @router.post("/meta/initiate", response_model=OAuthInitiateResponse)
 async def initiate_meta_oauth(
@@ -382,16 +457,8 @@ async def initiate_meta_oauth(
         redirect_uri=request.redirect_uri,
     )
     
-    # Build authorization URL
-    params = {
-        "client_id": settings.meta_app_id,
-        "redirect_uri": settings.meta_redirect_uri,
-        "response_type": "code",
-        "scope": ",".join(META_SCOPES),
-        "state": state,
-    }
-    
-    authorization_url = f"{META_AUTH_URL}?{urllib.parse.urlencode(params)}"
+    # Build authorization URL (only state varies per request)
+    authorization_url = f"{_META_AUTH_PREFIX}&state={urllib.parse.quote(state, safe='')}"
     
     return OAuthInitiateResponse(
         authorization_url=authorization_url,
@@ -402,6 +469,8 @@ async def initiate_meta_oauth(
 
 @router.get("/meta/callback")
 async def meta_oauth_callback(
+    background_tasks: BackgroundTasks,
+    supabase: Supabase,
     code: Optional[str] = None,
     state: Optional[str] = None,
     error: Optional[str] = None,
@@ -412,6 +481,8 @@ async def meta_oauth_callback(
     Handle Meta OAuth callback.
     
     Exchanges authorization code for tokens and stores the connected account.
+    A new account row is written in the background so the redirect is not
+    held up by the database insert; reconnects are written before redirecting.
     """
     # Check for errors
     if error:
@@ -499,7 +570,6 @@ async def meta_oauth_callback(
     fb_id = fb_user.get("id", "unknown")
     
     # Get user's org_id
-    supabase = get_supabase_service()
     user = await supabase.get_user(user_id)
     if not user:
         raise HTTPException(
@@ -512,6 +582,13 @@ async def meta_oauth_callback(
     # Store connected account
     from datetime import datetime, timedelta, timezone
     
+    # Reconnects keep the stored ID; new rows get theirs client-side so the
+    # redirect can reference it before the background insert has completed
+    existing_id = await supabase.get_connected_account_id(
+        org_id, Platform.META_ADS.value, fb_id
+    )
+    account_id = existing_id or _connected_account_id(org_id, Platform.META_ADS.value, fb_id)
+
     account_data = {
         "org_id": org_id,
         "connected_by": user_id,
@@ -525,25 +602,23 @@ async def meta_oauth_callback(
         ).isoformat(),
         "status": "active",
     }
+    if existing_id is None:
+        account_data["id"] = account_id
     
-    try:
-        account = await supabase.create_connected_account(account_data)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to save account: {str(e)}",
-        )
+    account_id = await _store_connected_account(
+        supabase, background_tasks, account_data, existing_id
+    )
     
     # Redirect or return response
     if redirect_uri:
         return RedirectResponse(
-            url=f"{redirect_uri}?success=true&account_id={account['id']}"
+            url=f"{redirect_uri}?success=true&account_id={account_id}"
         )
     
     return OAuthCallbackResponse(
         success=True,
-        account_id=account["id"],
-        account_name=account["platform_account_name"],
+        account_id=account_id,
+        account_name=account_data["platform_account_name"],
         platform=Platform.META_ADS,
         message="Meta Ads hesabı başarıyla bağlandı",
         redirect_uri=redirect_uri,
@@ -10,7 +10,8 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import StreamingResponse
 
-from app.api.deps import CurrentUser, CurrentOrgId, CurrentUserId
+from app.api.deps import CurrentUser, CurrentOrgId, CurrentUserId, Supabase
+from app.api.responses import model_response
 from app.models.chat import (
     ChatMessageRequest,
     ChatMessageResponse,
@@ -19,7 +20,6 @@ from app.models.chat import (
     ChatHistoryResponse,
 )
 from app.services.chat_service import ChatService
-from app.core.supabase import get_supabase_service
 
 logger = logging.getLogger(__name__)
 
@@ -84,15 +84,15 @@ async def list_threads(
     current_user: CurrentUser,
     org_id: CurrentOrgId,
     user_id: CurrentUserId,
+    supabase: Supabase,
 ):
     """Get all chat threads for the current user."""
-    supabase = get_supabase_service()
     threads = await supabase.get_chat_threads(org_id=org_id, user_id=user_id)
 
-    return ChatThreadList(
+    return model_response(ChatThreadList(
         threads=[ChatThreadResponse(**t) for t in threads],
         total=len(threads),
-    )
+    ))
 
 
 @router.get("/threads/{thread_id}", response_model=ChatHistoryResponse)
@@ -100,10 +100,9 @@ async def get_thread_history(
     thread_id: str,
     current_user: CurrentUser,
     org_id: CurrentOrgId,
+    supabase: Supabase,
 ):
     """Get a chat thread with its full message history."""
-    supabase = get_supabase_service()
-
     # Get thread with ownership check
     thread = await supabase.get_chat_thread(thread_id)
     if not thread or thread.get("org_id") != org_id:
@@ -115,10 +114,10 @@ async def get_thread_history(
     # Get messages
     messages = await supabase.get_chat_messages(thread_id)
 
-    return ChatHistoryResponse(
+    return model_response(ChatHistoryResponse(
         thread=ChatThreadResponse(**thread),
         messages=[ChatMessageResponse(**m) for m in messages],
-    )
+    ))
 
 
 @router.delete("/threads/{thread_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -126,10 +125,9 @@ async def delete_thread(
     thread_id: str,
     current_user: CurrentUser,
     org_id: CurrentOrgId,
+    supabase: Supabase,
 ):
     """Soft delete a chat thread (mark as inactive)."""
-    supabase = get_supabase_service()
-
     # Get thread with ownership check
     thread = await supabase.get_chat_thread(thread_id)
     if not thread or thread.get("org_id") != org_id:
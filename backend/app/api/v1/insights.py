@@ -9,13 +9,19 @@ from datetime import datetime, timezone
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import ValidationError
 
 from app.api.deps import CurrentUser, CurrentOrgId, Supabase
+from app.api.responses import model_response
+from app.cache import MISSING, TTLCache
+from app.core.supabase import SupabaseService
 from app.models.insight import (
     InsightResponse,
     InsightList,
     InsightReadRequest,
     InsightDismissRequest,
+    BulkIdsRequest,
+    BulkUpdateResponse,
     ActionResponse,
     ActionList,
     ActionExecuteRequest,
@@ -23,6 +29,9 @@ from app.models.insight import (
     ActionDismissRequest,
     DailyDigestResponse,
     DigestList,
+    ACTION_LIST_ADAPTER,
+    DIGEST_LIST_ADAPTER,
+    INSIGHT_LIST_ADAPTER,
     InsightType,
     InsightSeverity,
     ActionStatus,
@@ -32,6 +41,10 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/insights", tags=["Insights"])
 
+# Today's digest is written at most once a day by the digest task, so once
+# it exists it can be cached
+_digest_cache = TTLCache(maxsize=1024, ttl=300)
+
 
 # ===========================================
 # GENERATE ENDPOINT (must be before /{insight_id})
@@ -76,15 +89,14 @@ async def generate_insights(
         )
 
     # Fetch fresh insights to return
-    insights = await supabase.get_insights(org_id=org_id, limit=20)
-    all_insights = await supabase.get_insights(org_id=org_id, limit=100)
-    unread_count = sum(1 for i in all_insights if not i.get("is_read"))
+    insights, total = await supabase.get_insights_with_total(org_id=org_id, limit=20)
+    unread_count = await supabase.count_unread_insights(org_id)
 
-    return InsightList(
-        insights=[_parse_insight(i) for i in insights],
-        total=len(insights),
+    return model_response(InsightList(
+        insights=_parse_insights(insights),
+        total=total,
         unread_count=unread_count,
-    )
+    ))
 
 
 # ===========================================
@@ -105,27 +117,22 @@ async def list_insights(
 
     Filter by read status, type, or severity.
     """
-    insights = await supabase.get_insights(
+    insights, total = await supabase.get_insights_with_total(
         org_id=org_id,
         is_read=is_read,
         limit=limit,
+        insight_type=insight_type.value if insight_type else None,
+        severity=severity.value if severity else None,
     )
 
-    # Apply additional filters using correct DB column names
-    if insight_type:
-        insights = [i for i in insights if i.get("insight_type") == insight_type.value]
-    if severity:
-        insights = [i for i in insights if i.get("severity") == severity.value]
+    # Count unread in the database
+    unread_count = await supabase.count_unread_insights(org_id)
 
-    # Count unread
-    all_insights = await supabase.get_insights(org_id=org_id, limit=100)
-    unread_count = sum(1 for i in all_insights if not i.get("is_read"))
-
-    return InsightList(
-        insights=[_parse_insight(i) for i in insights],
-        total=len(insights),
+    return model_response(InsightList(
+        insights=_parse_insights(insights),
+        total=total,
         unread_count=unread_count,
-    )
+    ))
 
 
 @router.get("/{insight_id}", response_model=InsightResponse)
@@ -135,26 +142,15 @@ async def get_insight(
     supabase: Supabase,
 ):
     """Get a specific insight by ID."""
-    result = supabase.client.table("insights") \
-        .select("*, recommended_actions(*)") \
-        .eq("id", insight_id) \
-        .limit(1) \
-        .execute()
+    insight = await supabase.get_insight_with_actions(insight_id, org_id)
 
-    if not result.data:
+    if insight is None:
+        await _raise_scoped_miss(supabase, "insights", insight_id, org_id, "Insight not found")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Insight not found",
         )
 
-    insight = result.data[0]
-
-    if insight["org_id"] != org_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied",
-        )
-
     return _parse_insight(insight)
 
 
@@ -162,32 +158,43 @@ async def get_insight(
 # INSIGHT ACTIONS
 # ===========================================
 
+# Bulk routes must be registered before /{insight_id}/... so "bulk" is not
+# captured as an insight ID.
+
+@router.post("/bulk/read", response_model=BulkUpdateResponse)
+async def mark_insights_read(
+    request: BulkIdsRequest,
+    org_id: CurrentOrgId,
+    supabase: Supabase,
+):
+    """Mark several insights as read in one update. IDs outside the org are ignored."""
+    updated = await supabase.mark_insights_read(request.ids, org_id)
+    return BulkUpdateResponse(updated_count=len(updated))
+
+
+@router.post("/bulk/dismiss", response_model=BulkUpdateResponse)
+async def dismiss_insights(
+    request: BulkIdsRequest,
+    org_id: CurrentOrgId,
+    supabase: Supabase,
+):
+    """Dismiss several insights in one update. IDs outside the org are ignored."""
+    updated = await supabase.dismiss_insights(request.ids, org_id)
+    return BulkUpdateResponse(updated_count=len(updated))
+
+
 @router.post("/{insight_id}/read", status_code=status.HTTP_204_NO_CONTENT)
 async def mark_insight_read(
     insight_id: str,
     org_id: CurrentOrgId,
     supabase: Supabase,
 ):
-    """Mark an insight as read."""
-    result = supabase.client.table("insights") \
-        .select("org_id") \
-        .eq("id", insight_id) \
-        .limit(1) \
-        .execute()
-
-    if not result.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Insight not found",
-        )
+    """Mark an insight as read (the bulk path with a single ID)."""
+    updated = await supabase.mark_insights_read([insight_id], org_id)
 
-    if result.data[0]["org_id"] != org_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied",
-        )
+    if not updated:
+        await _raise_scoped_miss(supabase, "insights", insight_id, org_id, "Insight not found")
 
-    await supabase.mark_insight_read(insight_id)
     return None
 
 
@@ -198,31 +205,11 @@ async def dismiss_insight(
     org_id: CurrentOrgId,
     supabase: Supabase,
 ):
-    """Dismiss an insight (hide from list)."""
-    result = supabase.client.table("insights") \
-        .select("org_id") \
-        .eq("id", insight_id) \
-        .limit(1) \
-        .execute()
-
-    if not result.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Insight not found",
-        )
-
-    if result.data[0]["org_id"] != org_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied",
-        )
+    """Dismiss an insight (hide from list). Uses the bulk path with a single ID."""
+    updated = await supabase.dismiss_insights([insight_id], org_id)
 
-    supabase.client.table("insights") \
-        .update({
-            "is_dismissed": True,
-        }) \
-        .eq("id", insight_id) \
-        .execute()
+    if not updated:
+        await _raise_scoped_miss(supabase, "insights", insight_id, org_id, "Insight not found")
 
     return None
 
@@ -239,26 +226,19 @@ async def list_actions(
     limit: int = Query(20, ge=1, le=100),
 ):
     """List recommended actions for the organization."""
-    query = supabase.client.table("recommended_actions") \
-        .select("*") \
-        .eq("org_id", org_id)
-
-    if status_filter:
-        query = query.eq("status", status_filter.value)
-
-    result = query \
-        .order("created_at", desc=True) \
-        .limit(limit) \
-        .execute()
-
-    actions = result.data or []
+    # Exact total for the filter comes back with the page
+    actions, total = await supabase.get_actions_with_total(
+        org_id=org_id,
+        status=status_filter.value if status_filter else None,
+        limit=limit,
+    )
     pending_count = sum(1 for a in actions if a.get("status") == "pending")
 
-    return ActionList(
-        actions=[ActionResponse(**a) for a in actions],
-        total=len(actions),
+    return model_response(ActionList(
+        actions=ACTION_LIST_ADAPTER.validate_python(actions),
+        total=total,
         pending_count=pending_count,
-    )
+    ))
 
 
 @router.post("/actions/{action_id}/execute", response_model=ActionExecuteResponse)
@@ -275,43 +255,20 @@ async def execute_action(
     """
     org_id = current_user["org_id"]
 
-    result = supabase.client.table("recommended_actions") \
-        .select("*") \
-        .eq("id", action_id) \
-        .limit(1) \
-        .execute()
-
-    if not result.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Action not found",
-        )
-
-    action = result.data[0]
+    # TODO: Actually execute the action via platform connector
+    # For now, just mark as approved. The status guard makes the
+    # pending -> approved transition atomic.
+    updated = await supabase.approve_action(action_id, org_id, current_user["id"])
 
-    if action["org_id"] != org_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied",
+    if not updated:
+        action = await _raise_scoped_miss(
+            supabase, "recommended_actions", action_id, org_id, "Action not found"
         )
-
-    if action["status"] != "pending":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Action is not pending (current: {action['status']})",
         )
 
-    # TODO: Actually execute the action via platform connector
-    # For now, just mark as approved
-    supabase.client.table("recommended_actions") \
-        .update({
-            "status": "approved",
-            "executed_at": "now()",
-            "executed_by": current_user["id"],
-        }) \
-        .eq("id", action_id) \
-        .execute()
-
     return ActionExecuteResponse(
         success=True,
         action_id=action_id,
@@ -319,6 +276,17 @@ async def execute_action(
     )
 
 
+@router.post("/actions/bulk/dismiss", response_model=BulkUpdateResponse)
+async def dismiss_actions(
+    request: BulkIdsRequest,
+    org_id: CurrentOrgId,
+    supabase: Supabase,
+):
+    """Dismiss several recommended actions in one update. IDs outside the org are ignored."""
+    updated = await supabase.dismiss_actions(request.ids, org_id)
+    return BulkUpdateResponse(updated_count=len(updated))
+
+
 @router.post("/actions/{action_id}/dismiss", status_code=status.HTTP_204_NO_CONTENT)
 async def dismiss_action(
     action_id: str,
@@ -326,30 +294,14 @@ async def dismiss_action(
     org_id: CurrentOrgId,
     supabase: Supabase,
 ):
-    """Dismiss a recommended action."""
-    result = supabase.client.table("recommended_actions") \
-        .select("org_id") \
-        .eq("id", action_id) \
-        .limit(1) \
-        .execute()
-
-    if not result.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Action not found",
-        )
+    """Dismiss a recommended action (the bulk path with a single ID)."""
+    updated = await supabase.dismiss_actions([action_id], org_id)
 
-    if result.data[0]["org_id"] != org_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied",
+    if not updated:
+        await _raise_scoped_miss(
+            supabase, "recommended_actions", action_id, org_id, "Action not found"
         )
 
-    supabase.client.table("recommended_actions") \
-        .update({"status": "dismissed"}) \
-        .eq("id", action_id) \
-        .execute()
-
     return None
 
 
@@ -367,17 +319,19 @@ async def get_today_digest(
 
     today = date.today().isoformat()
 
-    result = supabase.client.table("daily_digests") \
-        .select("*") \
-        .eq("org_id", org_id) \
-        .eq("digest_date", today) \
-        .limit(1) \
-        .execute()
+    cache_key = (org_id, today)
+    digest = _digest_cache.get(cache_key)
+    if digest is MISSING:
+        digest = await supabase.get_daily_digest(org_id, today)
+        # A missing digest is not cached: the digest task can create it later
+        # today and has no way to invalidate this process's cache
+        if digest is not None:
+            _digest_cache.set(cache_key, digest)
 
-    if not result.data:
+    if digest is None:
         return None
 
-    return DailyDigestResponse(**result.data[0])
+    return DailyDigestResponse.model_validate(digest)
 
 
 @router.get("/digest/history", response_model=DigestList)
@@ -387,43 +341,89 @@ async def get_digest_history(
     limit: int = Query(7, ge=1, le=30),
 ):
     """Get historical daily digests."""
-    result = supabase.client.table("daily_digests") \
-        .select("*") \
-        .eq("org_id", org_id) \
-        .order("digest_date", desc=True) \
-        .limit(limit) \
-        .execute()
-
-    digests = result.data or []
-
-    return DigestList(
-        digests=[DailyDigestResponse(**d) for d in digests],
-        total=len(digests),
-    )
+    digests, total = await supabase.get_daily_digests_with_total(org_id, limit=limit)
+
+    return model_response(DigestList(
+        digests=DIGEST_LIST_ADAPTER.validate_python(digests),
+        total=total,
+    ))
 
 
 # ===========================================
 # HELPER FUNCTIONS
 # ===========================================
 
+def _parse_action_or_none(data: dict) -> Optional[ActionResponse]:
+    """Validate one action row, returning None if it doesn't fit ActionResponse."""
+    try:
+        return ActionResponse(**data)
+    except Exception:
+        return None
+
+
+async def _raise_scoped_miss(
+    supabase: SupabaseService,
+    table: str,
+    row_id: str,
+    org_id: str,
+    not_found_detail: str,
+) -> dict:
+    """
+    Explain why an org-scoped read or update matched no rows.
+
+    Only runs on the miss path. Raises 404 if the row does not exist and
+    403 if it belongs to another org; otherwise returns the row so the
+    caller can report a state conflict.
+    """
+    row = await supabase.get_row(table, row_id)
+
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=not_found_detail,
+        )
+
+    if row["org_id"] != org_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied",
+        )
+
+    return row
+
+
 def _parse_insight(data: dict) -> InsightResponse:
-    """Parse raw insight dict into InsightResponse, handling nested actions."""
-    # Make a copy to avoid mutating the original
-    data = dict(data)
+    """
+    Parse raw insight dict into InsightResponse, handling nested actions.
 
+    Consumes ``data``: callers pass throwaway PostgREST rows, so the join
+    keys are popped in place instead of copying the dict.
+    """
     # Extract recommended_actions from the join
-    actions_data = data.pop("recommended_actions", []) or []
+    actions_data = data.pop("recommended_actions", None) or []
     # Also remove connected_accounts join data if present
     data.pop("connected_accounts", None)
 
-    actions = []
-    for a in actions_data:
-        try:
-            actions.append(ActionResponse(**a))
-        except Exception:
-            pass
+    try:
+        actions = ACTION_LIST_ADAPTER.validate_python(actions_data)
+    except ValidationError:
+        # Rare: skip malformed rows instead of failing the whole insight
+        actions = [a for a in map(_parse_action_or_none, actions_data) if a is not None]
 
     return InsightResponse(
         recommended_actions=actions,
         **data,
     )
+
+
+def _parse_insights(rows: list[dict]) -> list[InsightResponse]:
+    """
+    Parse insight rows with their nested actions in one validation pass.
+
+    Falls back to per-row parsing (which skips malformed actions) only when
+    the batch fails, e.g. a row whose recommended_actions join is null.
+    """
+    try:
+        return INSIGHT_LIST_ADAPTER.validate_python(rows)
+    except ValidationError:
+        return [_parse_insight(i) for i in rows]
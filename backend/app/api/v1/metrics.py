@@ -4,13 +4,26 @@ Ad Platform MVP - Metrics Endpoints
 Metrics queries and aggregations.
 """
 
+import asyncio
+import heapq
+import logging
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Literal, Optional
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Iterable, Literal, Optional
 
 from fastapi import APIRouter, Query
 
 from app.api.deps import CurrentOrgId, Supabase
+from app.api.responses import model_response
+from app.cache import (
+    MISSING,
+    get_account_platform_map,
+    get_cached_metrics,
+    metrics_cache_key,
+    set_cached_metrics,
+)
+from app.core.supabase import SupabaseService
 from app.models.account import Platform
 from app.models.metrics import (
     DateRange,
@@ -21,81 +34,71 @@ from app.models.metrics import (
     CampaignMetrics,
     CampaignMetricsList,
     MetricsByPlatform,
+    MetricsDashboard,
     PlatformMetrics,
 )
 
 
 router = APIRouter(prefix="/metrics", tags=["Metrics"])
+logger = logging.getLogger(__name__)
+
+# Platform by value - a dict lookup instead of Enum.__call__ per row
+_PLATFORM_CACHE = {p.value: p for p in Platform}
+
+# Sort keys accepted by /campaigns - mirrors the campaign_metrics_agg
+# whitelist so the RPC and the Python fallback order rows the same way
+CampaignSortField = Literal[
+    "impressions", "clicks", "spend", "conversions", "conversion_value",
+    "ctr", "cpc", "cpm", "roas", "cpa", "name",
+]
+
+# Raw-row fallbacks sum currency / conversion columns as integer micros and
+# convert to Decimal once per output field instead of once per row.
+MICROS = 1_000_000
+
+
+def _micros(value) -> int:
+    """Convert a numeric column value to integer micros."""
+    return round(float(value or 0) * MICROS)
+
+
+def _from_micros(total: int) -> Decimal:
+    """Convert summed integer micros back to a Decimal amount."""
+    return Decimal(total) / MICROS
+
+
+def _last_month(today: date) -> tuple[date, date]:
+    """First and last day of the previous calendar month."""
+    last_of_prev_month = today.replace(day=1) - timedelta(days=1)
+    return last_of_prev_month.replace(day=1), last_of_prev_month
+
+
+# Preset -> resolver taking today's date; CUSTOM and unknown presets
+# default to the last 7 days
+_PRESETS: dict[DateRangePreset, Callable[[date], tuple[date, date]]] = {
+    DateRangePreset.TODAY: lambda t: (t, t),
+    DateRangePreset.YESTERDAY: lambda t: (t - timedelta(days=1), t - timedelta(days=1)),
+    DateRangePreset.LAST_7_DAYS: lambda t: (t - timedelta(days=6), t),
+    DateRangePreset.LAST_14_DAYS: lambda t: (t - timedelta(days=13), t),
+    DateRangePreset.LAST_30_DAYS: lambda t: (t - timedelta(days=29), t),
+    DateRangePreset.THIS_MONTH: lambda t: (t.replace(day=1), t),
+    DateRangePreset.LAST_MONTH: _last_month,
+}
+_DEFAULT_PRESET = _PRESETS[DateRangePreset.LAST_7_DAYS]
 
 
 def get_date_range(preset: DateRangePreset) -> tuple[date, date]:
     """Convert preset to actual date range."""
-    today = date.today()
-    
-    if preset == DateRangePreset.TODAY:
-        return today, today
-    elif preset == DateRangePreset.YESTERDAY:
-        yesterday = today - timedelta(days=1)
-        return yesterday, yesterday
-    elif preset == DateRangePreset.LAST_7_DAYS:
-        return today - timedelta(days=6), today
-    elif preset == DateRangePreset.LAST_14_DAYS:
-        return today - timedelta(days=13), today
-    elif preset == DateRangePreset.LAST_30_DAYS:
-        return today - timedelta(days=29), today
-    elif preset == DateRangePreset.THIS_MONTH:
-        return today.replace(day=1), today
-    elif preset == DateRangePreset.LAST_MONTH:
-        first_of_this_month = today.replace(day=1)
-        last_of_prev_month = first_of_this_month - timedelta(days=1)
-        first_of_prev_month = last_of_prev_month.replace(day=1)
-        return first_of_prev_month, last_of_prev_month
-    else:
-        # Default to last 7 days
-        return today - timedelta(days=6), today
+    return _PRESETS.get(preset, _DEFAULT_PRESET)(date.today())
 
 
-@router.get("/summary", response_model=MetricsSummary)
-async def get_metrics_summary(
-    org_id: CurrentOrgId,
-    supabase: Supabase,
-    preset: DateRangePreset = Query(
-        DateRangePreset.LAST_7_DAYS,
-        description="Preset date range"
-    ),
-    date_from: Optional[date] = None,
-    date_to: Optional[date] = None,
-    compare: bool = Query(True, description="Include comparison with previous period"),
-    account_id: Optional[str] = None,
-    platform: Optional[Platform] = None,
-):
-    """
-    Get aggregated metrics summary across all accounts.
-    
-    Includes comparison with previous period if requested.
-    """
-    # Determine date range
-    if date_from and date_to:
-        start_date, end_date = date_from, date_to
-    else:
-        start_date, end_date = get_date_range(preset)
-    
-    # Get metrics
-    metrics = await supabase.get_daily_metrics(
-        org_id=org_id,
-        date_from=start_date.isoformat(),
-        date_to=end_date.isoformat(),
-        account_id=account_id,
-    )
-    
-    # Aggregate - database stores spend directly in currency (not micros)
-    total_impressions = sum(m.get("impressions", 0) for m in metrics)
-    total_clicks = sum(m.get("clicks", 0) for m in metrics)
-    # Database uses 'spend' column directly (numeric, in TRY)
-    total_spend = sum(Decimal(str(m.get("spend", 0) or 0)) for m in metrics)
-    total_conversions = sum(Decimal(str(m.get("conversions", 0) or 0)) for m in metrics)
-    # Database uses 'conversion_value' column directly (numeric, in TRY)
-    total_conv_value = sum(Decimal(str(m.get("conversion_value", 0) or 0)) for m in metrics)
+def _build_summary(start_date: date, end_date: date, totals: dict) -> MetricsSummary:
+    """Build a MetricsSummary (with derived rates) from aggregated totals."""
+    total_impressions = totals.get("impressions") or 0
+    total_clicks = totals.get("clicks") or 0
+    total_spend = Decimal(str(totals.get("spend") or 0))
+    total_conversions = Decimal(str(totals.get("conversions") or 0))
+    total_conv_value = Decimal(str(totals.get("conversion_value") or 0))
     
     # Calculate rates
     ctr = None
@@ -104,24 +107,23 @@ async def get_metrics_summary(
     roas = None
     cpa = None
     
+    # Ratios are reporting values: float division, as in BaseMetrics
+    spend = float(total_spend)
+
     if total_impressions > 0:
-        ctr = Decimal(total_clicks) / Decimal(total_impressions) * 100
-        cpm = total_spend / Decimal(total_impressions) * 1000
+        ctr = total_clicks / total_impressions * 100.0
+        cpm = spend / total_impressions * 1000.0
     
     if total_clicks > 0:
-        cpc = total_spend / Decimal(total_clicks)
+        cpc = spend / total_clicks
     
     if total_spend > 0:
-        roas = total_conv_value / total_spend
+        roas = float(total_conv_value) / spend
     
     if total_conversions > 0:
-        cpa = total_spend / total_conversions
-    
-    # Get unique counts - use entity_id for campaign ID
-    account_ids = set(m.get("account_id") for m in metrics)
-    campaign_ids = set(m.get("entity_id") for m in metrics if m.get("entity_id"))
+        cpa = spend / float(total_conversions)
     
-    summary = MetricsSummary(
+    return MetricsSummary(
         date_from=start_date,
         date_to=end_date,
         impressions=total_impressions,
@@ -135,12 +137,254 @@ async def get_metrics_summary(
         cpm=cpm,
         roas=roas,
         cpa=cpa,
-        accounts_count=len(account_ids),
-        campaigns_count=len(campaign_ids),
+        accounts_count=totals.get("accounts_count") or 0,
+        campaigns_count=totals.get("campaigns_count") or 0,
     )
+
+
+def _totals_from_groups(rows: list[dict]) -> dict:
+    """Sum already-grouped RPC rows (per day / per platform) into period totals."""
+    return {
+        "impressions": sum(map(itemgetter("impressions"), rows)),
+        "clicks": sum(map(itemgetter("clicks"), rows)),
+        "spend": _from_micros(sum(map(_micros, map(itemgetter("spend"), rows)))),
+        "conversions": _from_micros(sum(map(_micros, map(itemgetter("conversions"), rows)))),
+        "conversion_value": _from_micros(
+            sum(map(_micros, map(itemgetter("conversion_value"), rows)))
+        ),
+    }
+
+
+def _totals_from_daily_rows(rows: list[dict]) -> dict:
+    """Period totals from metrics_daily rows."""
+    totals = _totals_from_groups(rows)
+    # Distinct counts are period-wide and repeated on every row
+    if rows:
+        totals["accounts_count"] = rows[0]["accounts_count"]
+        totals["campaigns_count"] = rows[0]["campaigns_count"]
+    return totals
+
+
+def _totals_from_platform_rows(rows: list[dict]) -> dict:
+    """Period totals from metrics_by_platform rows."""
+    totals = _totals_from_groups(rows)
+    # Accounts and campaigns belong to exactly one platform, so the
+    # per-platform distinct counts add up to the period totals
+    totals["accounts_count"] = sum(r["accounts_count"] for r in rows)
+    totals["campaigns_count"] = sum(r["campaigns_count"] for r in rows)
+    return totals
+
+
+def _daily_from_rows(rows: list[dict]) -> list[MetricsByDate]:
+    """Map metrics_daily RPC rows to MetricsByDate."""
+    return [
+        MetricsByDate(
+            date=date.fromisoformat(r["date"]),
+            impressions=r["impressions"],
+            clicks=r["clicks"],
+            spend=Decimal(str(r["spend"])),
+            conversions=Decimal(str(r["conversions"])),
+            conversion_value=Decimal(str(r["conversion_value"])),
+        )
+        for r in rows
+    ]
+
+
+def _platforms_from_rows(rows: list[dict]) -> list[PlatformMetrics]:
+    """Map metrics_by_platform RPC rows to PlatformMetrics."""
+    return [
+        PlatformMetrics(
+            platform=_PLATFORM_CACHE[r["platform"]],
+            impressions=r["impressions"],
+            clicks=r["clicks"],
+            spend=Decimal(str(r["spend"])),
+            currency="TRY",
+            conversions=Decimal(str(r["conversions"])),
+            conversion_value=Decimal(str(r["conversion_value"])),
+            accounts_count=r["accounts_count"],
+            campaigns_count=r["campaigns_count"],
+        )
+        for r in rows
+    ]
+
+
+# daily_metrics columns the Python fallbacks read
+_FALLBACK_COLUMNS = (
+    "date,account_id,campaign_id,entity_id,platform,"
+    "impressions,clicks,spend,conversions,conversion_value"
+)
+
+# Pulls every summed column of a daily_metrics row in one C-level call
+_metric_values = itemgetter(
+    "impressions", "clicks", "spend", "conversions", "conversion_value"
+)
+
+
+def _group_totals(
+    metrics: Iterable[dict],
+    key_of: Callable[[dict], Any],
+    groups: dict[Any, list],
+    with_ids: bool = False,
+) -> None:
+    """
+    Fold raw daily_metrics rows into ``groups`` by ``key_of(row)``.
+
+    Called once per fetched page, so a range is aggregated without holding
+    all of its rows. Each bucket is a list laid out as
+    ``[impressions, clicks, spend, conversions, conversion_value]`` with
+    amounts as integer micros; with ``with_ids`` it also carries the
+    distinct account_ids and campaign_ids (entity_id) sets. Rows with a
+    falsy key are skipped.
+    """
+    for m in metrics:
+        key = key_of(m)
+        if not key:
+            continue
+        impressions, clicks, spend, conversions, conv_value = _metric_values(m)
+        g = groups.get(key)
+        if g is None:
+            g = groups[key] = [0, 0, 0, 0, 0, set(), set()] if with_ids else [0, 0, 0, 0, 0]
+        g[0] += impressions or 0
+        g[1] += clicks or 0
+        g[2] += _micros(spend)
+        g[3] += _micros(conversions)
+        g[4] += _micros(conv_value)
+        if with_ids:
+            g[5].add(m.get("account_id"))
+            if m.get("entity_id"):
+                g[6].add(m.get("entity_id"))
+
+
+# Bucket for keys with no rows
+_EMPTY_GROUP = (0, 0, 0, 0, 0)
+
+
+def _whole_period(m: dict) -> bool:
+    """``key_of`` that puts every row in one bucket, for period totals."""
+    return True
+
+
+def _platform_key(account_platform: dict[str, str]) -> Callable[[dict], Optional[str]]:
+    """``key_of`` by platform; rows without one inherit their account's."""
+    return lambda m: m.get("platform") or account_platform.get(m.get("account_id"))
+
+
+def _period_totals(groups: dict[Any, list]) -> dict:
+    """Fallback for the metrics_summary RPC: totals from a ``_whole_period`` fold."""
+    g = groups.get(True)
+    if g is None:
+        return {}
+    impressions, clicks, spend, conversions, conv_value, account_ids, campaign_ids = g
+    
+    # Database stores spend / conversion_value directly in currency (not micros)
+    return {
+        "impressions": impressions,
+        "clicks": clicks,
+        "spend": _from_micros(spend),
+        "conversions": _from_micros(conversions),
+        "conversion_value": _from_micros(conv_value),
+        "accounts_count": len(account_ids),
+        "campaigns_count": len(campaign_ids),
+    }
+
+
+def _daily_from_groups(groups: dict[Any, list]) -> list[MetricsByDate]:
+    """Fallback for the metrics_daily RPC: rows from a fold keyed by date."""
+    # Convert to list - spend is already in currency
+    data = []
+    for d, (impressions, clicks, spend, conversions, conv_value) in sorted(groups.items()):
+        data.append(MetricsByDate(
+            date=date.fromisoformat(d) if isinstance(d, str) else d,
+            impressions=impressions,
+            clicks=clicks,
+            spend=_from_micros(spend),
+            conversions=_from_micros(conversions),
+            conversion_value=_from_micros(conv_value),
+        ))
+    return data
+
+
+def _platforms_from_groups(groups: dict[Any, list]) -> list[PlatformMetrics]:
+    """Fallback for the metrics_by_platform RPC: rows from a ``_platform_key`` fold."""
+    # Build response - spend is already in currency
+    platforms = []
+    for p, agg in groups.items():
+        impressions, clicks, spend, conversions, conv_value, account_ids, campaign_ids = agg
+        platforms.append(PlatformMetrics(
+            platform=_PLATFORM_CACHE[p],
+            impressions=impressions,
+            clicks=clicks,
+            spend=_from_micros(spend),
+            currency="TRY",
+            conversions=_from_micros(conversions),
+            conversion_value=_from_micros(conv_value),
+            accounts_count=len(account_ids),
+            campaigns_count=len(campaign_ids),
+        ))
+    return platforms
+
+
+@router.get("/summary", response_model=MetricsSummary)
+async def get_metrics_summary(
+    org_id: CurrentOrgId,
+    supabase: Supabase,
+    preset: DateRangePreset = Query(
+        DateRangePreset.LAST_7_DAYS,
+        description="Preset date range"
+    ),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    compare: bool = Query(True, description="Include comparison with previous period"),
+    account_id: Optional[str] = None,
+    platform: Optional[Platform] = None,
+):
+    """
+    Get aggregated metrics summary across all accounts.
+    
+    Includes comparison with previous period if requested.
+    """
+    # Determine date range
+    if date_from and date_to:
+        start_date, end_date = date_from, date_to
+    else:
+        start_date, end_date = get_date_range(preset)
+    
+    cache_key = await metrics_cache_key("summary", org_id, start_date, end_date, account_id, platform)
+    cached = get_cached_metrics(cache_key)
+    if cached is not MISSING:
+        return cached
+    
+    try:
+        totals = await supabase.get_metrics_summary_agg(
+            org_id=org_id,
+            date_from=start_date.isoformat(),
+            date_to=end_date.isoformat(),
+            account_id=account_id,
+            platform=platform.value if platform else None,
+        )
+    except Exception as e:
+        logger.warning(f"metrics_summary RPC failed, aggregating in Python: {e}")
+        key_of = _whole_period
+        if platform:
+            # Rows without a platform inherit their account's, as in the RPC
+            platform_of = _platform_key(await get_account_platform_map(supabase, org_id))
+            key_of = lambda m: platform_of(m) == platform.value
+        period = {}
+        async for page in supabase.iter_daily_metrics(
+            org_id=org_id,
+            date_from=start_date.isoformat(),
+            date_to=end_date.isoformat(),
+            account_id=account_id,
+            columns=_FALLBACK_COLUMNS,
+        ):
+            _group_totals(page, key_of, period, with_ids=True)
+        totals = _period_totals(period)
+    
+    summary = _build_summary(start_date, end_date, totals)
     
     # TODO: Add comparison period metrics
     
+    set_cached_metrics(cache_key, summary, end_date)
     return summary
 
 
@@ -164,60 +408,48 @@ async def get_daily_metrics(
     else:
         start_date, end_date = get_date_range(preset)
     
-    # Get metrics
-    metrics = await supabase.get_daily_metrics(
-        org_id=org_id,
-        date_from=start_date.isoformat(),
-        date_to=end_date.isoformat(),
-        account_id=account_id,
-    )
+    cache_key = await metrics_cache_key("daily", org_id, start_date, end_date, account_id)
+    cached = get_cached_metrics(cache_key)
+    if cached is not MISSING:
+        return cached
     
-    # Group by date - database stores spend directly in currency
-    from collections import defaultdict
-    daily_agg = defaultdict(lambda: {
-        "impressions": 0,
-        "clicks": 0,
-        "spend": Decimal("0"),
-        "conversions": Decimal("0"),
-        "conversion_value": Decimal("0"),
-    })
-
-    for m in metrics:
-        d = m.get("date")
-        daily_agg[d]["impressions"] += m.get("impressions", 0)
-        daily_agg[d]["clicks"] += m.get("clicks", 0)
-        daily_agg[d]["spend"] += Decimal(str(m.get("spend", 0) or 0))
-        daily_agg[d]["conversions"] += Decimal(str(m.get("conversions", 0) or 0))
-        daily_agg[d]["conversion_value"] += Decimal(str(m.get("conversion_value", 0) or 0))
-
-    # Convert to list - spend is already in currency
-    data = []
-    for d, agg in sorted(daily_agg.items()):
-        data.append(MetricsByDate(
-            date=date.fromisoformat(d) if isinstance(d, str) else d,
-            impressions=agg["impressions"],
-            clicks=agg["clicks"],
-            spend=agg["spend"],
-            conversions=agg["conversions"],
-            conversion_value=agg["conversion_value"],
-        ))
+    try:
+        rows = await supabase.get_metrics_daily_agg(
+            org_id=org_id,
+            date_from=start_date.isoformat(),
+            date_to=end_date.isoformat(),
+            account_id=account_id,
+        )
+    except Exception as e:
+        logger.warning(f"metrics_daily RPC failed, aggregating in Python: {e}")
+        daily_groups = {}
+        period = {}
+        async for page in supabase.iter_daily_metrics(
+            org_id=org_id,
+            date_from=start_date.isoformat(),
+            date_to=end_date.isoformat(),
+            account_id=account_id,
+            columns=_FALLBACK_COLUMNS,
+        ):
+            _group_totals(page, itemgetter("date"), daily_groups)
+            _group_totals(page, _whole_period, period, with_ids=True)
+        data = _daily_from_groups(daily_groups)
+        totals = _period_totals(period)
+    else:
+        data = _daily_from_rows(rows)
+        totals = _totals_from_daily_rows(rows)
     
-    # Get summary
-    summary = await get_metrics_summary(
-        org_id=org_id,
-        supabase=supabase,
-        date_from=start_date,
-        date_to=end_date,
-        compare=False,
-        account_id=account_id,
-    )
+    # Summary from the rows already in hand - no second fetch
+    summary = _build_summary(start_date, end_date, totals)
     
-    return MetricsTrend(
+    response = MetricsTrend(
         date_from=start_date,
         date_to=end_date,
         data=data,
         summary=summary,
     )
+    set_cached_metrics(cache_key, response, end_date)
+    return response
 
 
 @router.get("/campaigns", response_model=CampaignMetricsList)
@@ -229,7 +461,7 @@ async def get_campaign_metrics(
     date_to: Optional[date] = None,
     account_id: Optional[str] = None,
     platform: Optional[Platform] = None,
-    sort_by: str = Query("spend", description="Sort by field"),
+    sort_by: CampaignSortField = Query("spend", description="Sort by field"),
     sort_order: Literal["asc", "desc"] = Query("desc"),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
@@ -245,91 +477,170 @@ async def get_campaign_metrics(
     else:
         start_date, end_date = get_date_range(preset)
     
-    # Get all campaigns for the org's accounts
-    accounts = await supabase.get_connected_accounts(org_id=org_id)
-    
-    all_campaigns = []
-    for account in accounts:
-        if platform and account["platform"] != platform.value:
-            continue
-        if account_id and account["id"] != account_id:
-            continue
-        
-        campaigns = await supabase.get_campaigns(account["id"])
-        for c in campaigns:
-            c["account_platform"] = account["platform"]
-        all_campaigns.extend(campaigns)
-    
-    # Get metrics for each campaign
-    metrics = await supabase.get_daily_metrics(
-        org_id=org_id,
-        date_from=start_date.isoformat(),
-        date_to=end_date.isoformat(),
-        account_id=account_id,
+    cache_key = await metrics_cache_key(
+        "campaigns", org_id, start_date, end_date, account_id, platform,
+        sort_by, sort_order, page, per_page,
     )
+    cached = get_cached_metrics(cache_key)
+    if cached is not MISSING:
+        return model_response(cached)
     
-    # Aggregate by campaign
-    from collections import defaultdict
-    campaign_metrics = defaultdict(lambda: {
-        "impressions": 0,
-        "clicks": 0,
-        "spend": Decimal("0"),
-        "conversions": Decimal("0"),
-        "conversion_value": Decimal("0"),
-    })
+    reverse = sort_order == "desc"
+    
+    try:
+        rows = await supabase.get_campaign_metrics_agg(
+            org_id=org_id,
+            date_from=start_date.isoformat(),
+            date_to=end_date.isoformat(),
+            account_id=account_id,
+            platform=platform.value if platform else None,
+            sort_by=sort_by,
+            sort_desc=reverse,
+            limit=per_page,
+            offset=(page - 1) * per_page,
+        )
+    except Exception as e:
+        logger.warning(f"campaign_metrics_agg RPC failed, aggregating in Python: {e}")
+        paginated, total = await _campaign_metrics_in_python(
+            supabase, org_id, start_date, end_date, account_id, platform,
+            sort_by, reverse, page, per_page,
+        )
+    else:
+        if rows:
+            total = rows[0]["total_count"]
+        elif page > 1:
+            # Past the last page the RPC returns no row to carry
+            # total_count; read it from the first row instead
+            first = await supabase.get_campaign_metrics_agg(
+                org_id=org_id,
+                date_from=start_date.isoformat(),
+                date_to=end_date.isoformat(),
+                account_id=account_id,
+                platform=platform.value if platform else None,
+                sort_by=sort_by,
+                sort_desc=reverse,
+                limit=1,
+                offset=0,
+            )
+            total = first[0]["total_count"] if first else 0
+        else:
+            total = 0
+        # Values are already typed above - skip re-validation
+        paginated = [
+            CampaignMetrics.model_construct(
+                id=r["id"],
+                account_id=r["account_id"],
+                platform=_PLATFORM_CACHE[r["platform"]],
+                platform_campaign_id=r["platform_campaign_id"],
+                name=r["name"],
+                status=r.get("status") or "unknown",
+                campaign_type=r.get("campaign_type"),
+                date_from=start_date,
+                date_to=end_date,
+                impressions=r["impressions"],
+                clicks=r["clicks"],
+                spend=Decimal(str(r["spend"])),
+                currency="TRY",
+                conversions=Decimal(str(r["conversions"])),
+                conversion_value=Decimal(str(r["conversion_value"])),
+            )
+            for r in rows
+        ]
+    
+    response = CampaignMetricsList(
+        campaigns=paginated,
+        total=total,
+        page=page,
+        per_page=per_page,
+    )
+    set_cached_metrics(cache_key, response, end_date)
+    return model_response(response)
 
-    for m in metrics:
-        cid = m.get("campaign_id")
-        if cid:
-            campaign_metrics[cid]["impressions"] += m.get("impressions", 0)
-            campaign_metrics[cid]["clicks"] += m.get("clicks", 0)
-            campaign_metrics[cid]["spend"] += Decimal(str(m.get("spend", 0) or 0))
-            campaign_metrics[cid]["conversions"] += Decimal(str(m.get("conversions", 0) or 0))
-            campaign_metrics[cid]["conversion_value"] += Decimal(str(m.get("conversion_value", 0) or 0))
+
+async def _campaign_metrics_in_python(
+    supabase: SupabaseService,
+    org_id: str,
+    start_date: date,
+    end_date: date,
+    account_id: Optional[str],
+    platform: Optional[Platform],
+    sort_by: CampaignSortField,
+    reverse: bool,
+    page: int,
+    per_page: int,
+) -> tuple[list[CampaignMetrics], int]:
+    """Fallback for /campaigns when the campaign_metrics_agg RPC is unavailable."""
+    async def aggregate_by_campaign() -> dict[Any, list]:
+        groups = {}
+        async for rows in supabase.iter_daily_metrics(
+            org_id=org_id,
+            date_from=start_date.isoformat(),
+            date_to=end_date.isoformat(),
+            account_id=account_id,
+            columns=_FALLBACK_COLUMNS,
+        ):
+            _group_totals(rows, itemgetter("campaign_id"), groups)
+        return groups
+    
+    # Metrics don't depend on the account / campaign lookups - start them first
+    metrics_task = asyncio.create_task(aggregate_by_campaign())
+    try:
+        # Get all campaigns for the org's accounts
+        account_platform = await get_account_platform_map(supabase, org_id)
+        
+        ids = [
+            aid for aid, p in account_platform.items()
+            if (not platform or p == platform.value)
+            and (not account_id or aid == account_id)
+        ]
+        all_campaigns = await supabase.get_campaigns_for_accounts(ids)
+    except BaseException:
+        metrics_task.cancel()
+        raise
+    campaign_metrics = await metrics_task
 
     # Build response
     result = []
     for campaign in all_campaigns:
-        cid = campaign["id"]
-        cm = campaign_metrics.get(cid, {})
-
-        spend = cm.get("spend", Decimal("0"))
-        conv_value = cm.get("conversion_value", Decimal("0"))
+        impressions, clicks, spend, conversions, conv_value = \
+            campaign_metrics.get(campaign["id"], _EMPTY_GROUP)
         
-        result.append(CampaignMetrics(
+        result.append(CampaignMetrics.model_construct(
             id=campaign["id"],
             account_id=campaign["account_id"],
-            platform=Platform(campaign.get("account_platform", campaign["platform"])),
+            platform=_PLATFORM_CACHE[account_platform[campaign["account_id"]]],
             platform_campaign_id=campaign["platform_campaign_id"],
             name=campaign["name"],
             status=campaign.get("status", "unknown"),
             campaign_type=campaign.get("campaign_type"),
             date_from=start_date,
             date_to=end_date,
-            impressions=cm.get("impressions", 0),
-            clicks=cm.get("clicks", 0),
-            spend=spend,
+            impressions=impressions,
+            clicks=clicks,
+            spend=_from_micros(spend),
             currency="TRY",
-            conversions=cm.get("conversions", Decimal("0")),
-            conversion_value=conv_value,
+            conversions=_from_micros(conversions),
+            conversion_value=_from_micros(conv_value),
         ))
     
-    # Sort
-    reverse = sort_order == "desc"
-    result.sort(key=lambda x: getattr(x, sort_by, 0) or 0, reverse=reverse)
-    
-    # Paginate
+    # Sort + paginate - compute each sort key once up front
     total = len(result)
     start = (page - 1) * per_page
     end = start + per_page
-    paginated = result[start:end]
+    # sort_by is a whitelisted CampaignMetrics field / rate property
+    sort_values = map(attrgetter(sort_by), result)
+    keyed = [(v or 0, x) for v, x in zip(sort_values, result)]
+    by_key = itemgetter(0)
     
-    return CampaignMetricsList(
-        campaigns=paginated,
-        total=total,
-        page=page,
-        per_page=per_page,
-    )
+    if page == 1:
+        # Partial sort: O(n log k) for the first page
+        pick = heapq.nlargest if reverse else heapq.nsmallest
+        paginated = [x for _, x in pick(per_page, keyed, key=by_key)]
+    else:
+        keyed.sort(key=by_key, reverse=reverse)
+        paginated = [x for _, x in keyed[start:end]]
+    
+    return paginated, total
 
 
 @router.get("/by-platform", response_model=MetricsByPlatform)
@@ -352,70 +663,124 @@ async def get_metrics_by_platform(
     else:
         start_date, end_date = get_date_range(preset)
     
-    # Get metrics (with optional account filter)
-    metrics = await supabase.get_daily_metrics(
-        org_id=org_id,
-        date_from=start_date.isoformat(),
-        date_to=end_date.isoformat(),
-        account_id=account_id,
-    )
-
-    # Get accounts for platform info
-    accounts = await supabase.get_connected_accounts(org_id=org_id)
-    account_platform = {a["id"]: a["platform"] for a in accounts}
-    
-    # Aggregate by platform - database stores spend directly in currency
-    from collections import defaultdict
-    platform_agg = defaultdict(lambda: {
-        "impressions": 0,
-        "clicks": 0,
-        "spend": Decimal("0"),
-        "conversions": Decimal("0"),
-        "conversion_value": Decimal("0"),
-        "account_ids": set(),
-        "campaign_ids": set(),
-    })
-
-    for m in metrics:
-        p = m.get("platform") or account_platform.get(m.get("account_id"))
-        if p:
-            platform_agg[p]["impressions"] += m.get("impressions", 0)
-            platform_agg[p]["clicks"] += m.get("clicks", 0)
-            platform_agg[p]["spend"] += Decimal(str(m.get("spend", 0) or 0))
-            platform_agg[p]["conversions"] += Decimal(str(m.get("conversions", 0) or 0))
-            platform_agg[p]["conversion_value"] += Decimal(str(m.get("conversion_value", 0) or 0))
-            platform_agg[p]["account_ids"].add(m.get("account_id"))
-            if m.get("entity_id"):
-                platform_agg[p]["campaign_ids"].add(m.get("entity_id"))
-
-    # Build response - spend is already in currency
-    platforms = []
-    for p, agg in platform_agg.items():
-        platforms.append(PlatformMetrics(
-            platform=Platform(p),
-            impressions=agg["impressions"],
-            clicks=agg["clicks"],
-            spend=agg["spend"],
-            currency="TRY",
-            conversions=agg["conversions"],
-            conversion_value=agg["conversion_value"],
-            accounts_count=len(agg["account_ids"]),
-            campaigns_count=len(agg["campaign_ids"]),
-        ))
+    cache_key = await metrics_cache_key("by-platform", org_id, start_date, end_date, account_id)
+    cached = get_cached_metrics(cache_key)
+    if cached is not MISSING:
+        return cached
+    
+    try:
+        rows = await supabase.get_metrics_by_platform_agg(
+            org_id=org_id,
+            date_from=start_date.isoformat(),
+            date_to=end_date.isoformat(),
+            account_id=account_id,
+        )
+    except Exception as e:
+        logger.warning(f"metrics_by_platform RPC failed, aggregating in Python: {e}")
+        platform_of = _platform_key(await get_account_platform_map(supabase, org_id))
+        platform_groups = {}
+        period = {}
+        async for page in supabase.iter_daily_metrics(
+            org_id=org_id,
+            date_from=start_date.isoformat(),
+            date_to=end_date.isoformat(),
+            account_id=account_id,
+            columns=_FALLBACK_COLUMNS,
+        ):
+            _group_totals(page, platform_of, platform_groups, with_ids=True)
+            _group_totals(page, _whole_period, period, with_ids=True)
+        platforms = _platforms_from_groups(platform_groups)
+        totals = _period_totals(period)
+    else:
+        platforms = _platforms_from_rows(rows)
+        totals = _totals_from_platform_rows(rows)
+    
+    # Total summary from the per-platform rows - no second fetch
+    total = _build_summary(start_date, end_date, totals)
     
-    # Get total summary (with optional account filter)
-    total = await get_metrics_summary(
-        org_id=org_id,
-        supabase=supabase,
+    response = MetricsByPlatform(
         date_from=start_date,
         date_to=end_date,
-        compare=False,
-        account_id=account_id,
+        platforms=platforms,
+        total=total,
     )
+    set_cached_metrics(cache_key, response, end_date)
+    return response
+
+
+@router.get("/dashboard", response_model=MetricsDashboard)
+async def get_dashboard_metrics(
+    org_id: CurrentOrgId,
+    supabase: Supabase,
+    preset: DateRangePreset = Query(DateRangePreset.LAST_7_DAYS),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    account_id: Optional[str] = None,
+):
+    """
+    Get summary, daily trend and platform breakdown in one call.
     
-    return MetricsByPlatform(
+    Replaces separate /summary, /daily and /by-platform requests when
+    rendering the dashboard.
+    """
+    # Determine date range
+    if date_from and date_to:
+        start_date, end_date = date_from, date_to
+    else:
+        start_date, end_date = get_date_range(preset)
+    
+    cache_key = await metrics_cache_key("dashboard", org_id, start_date, end_date, account_id)
+    cached = get_cached_metrics(cache_key)
+    if cached is not MISSING:
+        return cached
+    
+    try:
+        daily_rows, platform_rows = await asyncio.gather(
+            supabase.get_metrics_daily_agg(
+                org_id=org_id,
+                date_from=start_date.isoformat(),
+                date_to=end_date.isoformat(),
+                account_id=account_id,
+            ),
+            supabase.get_metrics_by_platform_agg(
+                org_id=org_id,
+                date_from=start_date.isoformat(),
+                date_to=end_date.isoformat(),
+                account_id=account_id,
+            ),
+        )
+    except Exception as e:
+        logger.warning(f"Metrics RPCs failed, aggregating dashboard in Python: {e}")
+        # Fetch raw rows once and fold each page three ways
+        platform_of = _platform_key(await get_account_platform_map(supabase, org_id))
+        daily_groups = {}
+        platform_groups = {}
+        period = {}
+        async for page in supabase.iter_daily_metrics(
+            org_id=org_id,
+            date_from=start_date.isoformat(),
+            date_to=end_date.isoformat(),
+            account_id=account_id,
+            columns=_FALLBACK_COLUMNS,
+        ):
+            _group_totals(page, itemgetter("date"), daily_groups)
+            _group_totals(page, platform_of, platform_groups, with_ids=True)
+            _group_totals(page, _whole_period, period, with_ids=True)
+        
+        daily = _daily_from_groups(daily_groups)
+        platforms = _platforms_from_groups(platform_groups)
+        totals = _period_totals(period)
+    else:
+        daily = _daily_from_rows(daily_rows)
+        platforms = _platforms_from_rows(platform_rows)
+        totals = _totals_from_daily_rows(daily_rows)
+    
+    response = MetricsDashboard(
         date_from=start_date,
         date_to=end_date,
+        summary=_build_summary(start_date, end_date, totals),
+        daily=daily,
         platforms=platforms,
-        total=total,
     )
+    set_cached_metrics(cache_key, response, end_date)
+    return response
@@ -0,0 +1,32 @@
+"""
+Ad Platform MVP - Cache Module
+
+Short-lived in-process caches for read-heavy endpoints.
+"""
+
+from app.cache.ttl import MISSING, TTLCache
+from app.cache.accounts import (
+    get_account_platform_map,
+    get_connected_accounts_cached,
+    invalidate_org_accounts,
+)
+from app.cache.metrics import (
+    bump_org_metrics_version,
+    get_cached_metrics,
+    invalidate_org_metrics,
+    metrics_cache_key,
+    set_cached_metrics,
+)
+
+__all__ = [
+    "MISSING",
+    "TTLCache",
+    "get_account_platform_map",
+    "get_connected_accounts_cached",
+    "invalidate_org_accounts",
+    "get_cached_metrics",
+    "set_cached_metrics",
+    "invalidate_org_metrics",
+    "metrics_cache_key",
+    "bump_org_metrics_version",
+]
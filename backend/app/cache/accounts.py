@@ -0,0 +1,53 @@
+"""
+Ad Platform MVP - Connected Accounts Cache
+
+Per-org cache of active connected accounts for read-mostly endpoints.
+"""
+
+from app.cache.ttl import MISSING, TTLCache
+from app.core.supabase import SupabaseService
+
+
+_accounts_cache = TTLCache(maxsize=1024, ttl=60)
+_platform_map_cache = TTLCache(maxsize=1024, ttl=60)
+
+
+async def get_connected_accounts_cached(
+    supabase: SupabaseService,
+    org_id: str,
+) -> list[dict]:
+    """
+    Get active connected accounts for an org, cached for 60 seconds.
+
+    Keyed on org_id only. The returned rows are shared between callers and
+    must not be mutated.
+    """
+    accounts = _accounts_cache.get(org_id)
+    if accounts is MISSING:
+        accounts = await supabase.get_connected_accounts(org_id=org_id)
+        _accounts_cache.set(org_id, accounts)
+    return accounts
+
+
+async def get_account_platform_map(
+    supabase: SupabaseService,
+    org_id: str,
+) -> dict[str, str]:
+    """
+    Get ``{account_id: platform}`` for an org's active accounts.
+
+    Built from the cached account list and cached alongside it, so the
+    dict is shared between callers and must not be mutated.
+    """
+    platform_map = _platform_map_cache.get(org_id)
+    if platform_map is MISSING:
+        accounts = await get_connected_accounts_cached(supabase, org_id)
+        platform_map = {a["id"]: a["platform"] for a in accounts}
+        _platform_map_cache.set(org_id, platform_map)
+    return platform_map
+
+
+def invalidate_org_accounts(org_id: str) -> None:
+    """Drop the cached account list after an org's accounts change."""
+    _accounts_cache.pop(org_id)
+    _platform_map_cache.pop(org_id)
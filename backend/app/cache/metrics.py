@@ -0,0 +1,102 @@
+"""
+Ad Platform MVP - Metrics Response Cache
+
+Per-org cache of /metrics responses keyed on the resolved filters.
+"""
+
+import logging
+from datetime import date
+from typing import Any, Hashable, Optional
+
+import redis
+from redis import asyncio as aioredis
+
+from app.cache.ttl import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Ranges that include today still receive new rows from syncs; closed
+# historical ranges only change when an older period is re-synced.
+LIVE_TTL = 60
+HISTORICAL_TTL = 3600
+
+_metrics_cache = TTLCache(maxsize=2048, ttl=HISTORICAL_TTL)
+
+# Per-org data version in Redis. Writers in other processes (Celery syncs,
+# other API workers) bump it; cache keys carry the version, which retires
+# every older entry for the org. The cost: every /metrics request, cache
+# hits included, pays one Redis GET before the in-process dict lookup.
+_VERSION_KEY = "metrics_version:{}"
+_async_redis: Optional[aioredis.Redis] = None
+_sync_redis: Optional[redis.Redis] = None
+
+
+def _get_async_redis() -> aioredis.Redis:
+    global _async_redis
+    if _async_redis is None:
+        _async_redis = aioredis.from_url(settings.redis_url, socket_timeout=0.5)
+    return _async_redis
+
+
+async def metrics_cache_key(endpoint: str, org_id: str, *filters: Hashable) -> tuple[Hashable, ...]:
+    """
+    Build a cache key for one /metrics response.
+
+    Keys are ``(endpoint, org_id, *filters, version)``. If Redis is
+    unreachable the version is None; Redis is also the Celery broker, so
+    no sync can write behind the cache's back while it is down.
+    """
+    try:
+        version = await _get_async_redis().get(_VERSION_KEY.format(org_id))
+    except redis.RedisError as e:
+        logger.warning(f"Metrics version lookup failed for org {org_id}: {e}")
+        version = None
+    return (endpoint, org_id, *filters, version)
+
+
+def get_cached_metrics(key: tuple[Hashable, ...]) -> Any:
+    """
+    Return a cached response or MISSING.
+
+    ``key`` comes from metrics_cache_key. Cached responses are shared
+    between callers and must not be mutated.
+    """
+    return _metrics_cache.get(key)
+
+
+def set_cached_metrics(key: tuple[Hashable, ...], value: Any, date_to: date) -> None:
+    """Cache a response; the TTL depends on whether the range is still open."""
+    ttl = LIVE_TTL if date_to >= date.today() else HISTORICAL_TTL
+    _metrics_cache.set(key, value, ttl=ttl)
+
+
+async def invalidate_org_metrics(org_id: str) -> None:
+    """
+    Drop every cached metrics response for an org after its data changes.
+
+    Clears this process's entries and bumps the Redis version so other
+    uvicorn workers and replicas stop serving theirs too.
+    """
+    _metrics_cache.pop_where(lambda key: key[1] == org_id)
+    try:
+        await _get_async_redis().incr(_VERSION_KEY.format(org_id))
+    except redis.RedisError as e:
+        logger.warning(f"Metrics version bump failed for org {org_id}: {e}")
+
+
+def bump_org_metrics_version(org_id: str) -> None:
+    """
+    Retire an org's cached metrics in every API process.
+
+    Called by out-of-process writers (Celery syncs) after daily_metrics
+    changes. Blocking; not for use on the event loop.
+    """
+    global _sync_redis
+    if _sync_redis is None:
+        _sync_redis = redis.Redis.from_url(settings.redis_url)
+    try:
+        _sync_redis.incr(_VERSION_KEY.format(org_id))
+    except redis.RedisError as e:
+        logger.warning(f"Metrics version bump failed for org {org_id}: {e}")
@@ -0,0 +1,150 @@
+"""
+Ad Platform MVP - Google Ads Rate Limiting
+
+Backoff, per-customer request pacing and adaptive concurrency for
+Google Ads API calls.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Callable, Optional, TypeVar, Union
+
+import grpc
+from google.ads.googleads.errors import GoogleAdsException
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# gRPC statuses worth retrying; everything else is a caller error. The
+# google-ads interceptor does not wrap RESOURCE_EXHAUSTED / INTERNAL, so
+# those arrive as plain grpc.RpcError.
+RETRYABLE_STATUSES = {"RESOURCE_EXHAUSTED", "DEADLINE_EXCEEDED", "UNAVAILABLE", "INTERNAL"}
+MAX_ATTEMPTS = 3
+MAX_BACKOFF_SECONDS = 60.0
+
+# Requests per customer per rolling minute before calls are paced
+CUSTOMER_RPM = 60
+
+# AIMD target: calls slower than this shrink the concurrency window
+TARGET_LATENCY_SECONDS = 2.0
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit adjusted additive-increase / multiplicative-decrease.
+
+    Each fast call grows the limit by ``1 / limit`` (about +1 per full
+    window); a throttled or slow call halves it.
+    """
+
+    def __init__(self, initial: float = 8.0, minimum: float = 1.0, maximum: float = 64.0):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, throttled: bool) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if throttled or latency > TARGET_LATENCY_SECONDS:
+                self.limit = max(self.minimum, self.limit / 2)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+_limiter = AdaptiveLimiter()
+_customer_calls: dict[str, deque] = defaultdict(deque)
+_customer_lock = threading.Lock()
+
+
+def _pace_customer(customer_id: str) -> None:
+    """Block until ``customer_id`` is under CUSTOMER_RPM for the last minute."""
+    while True:
+        with _customer_lock:
+            calls = _customer_calls[customer_id]
+            now = time.monotonic()
+            while calls and now - calls[0] >= 60:
+                calls.popleft()
+            if len(calls) < CUSTOMER_RPM:
+                calls.append(now)
+                return
+            wait = 60 - (now - calls[0])
+        time.sleep(wait)
+
+
+def error_code_kind(error) -> Optional[str]:
+    """
+    Name of the ``error_code`` oneof set on a GoogleAdsError.
+
+    ``GoogleAdsException.failure`` is always a proto-plus message (even with
+    use_proto_plus disabled), and proto-plus messages have no WhichOneof,
+    so the check runs on the underlying protobuf.
+    """
+    code = error.error_code
+    return type(code).pb(code).WhichOneof("error_code")
+
+
+def _retry_delay(ex: GoogleAdsException) -> Optional[float]:
+    """Server-suggested delay from a quota error, if any."""
+    for error in ex.failure.errors:
+        # proto-plus marshals the Duration to a datetime.timedelta
+        delay = error.details.quota_error_details.retry_delay
+        if delay:
+            return delay.total_seconds()
+    return None
+
+
+def _is_retryable(ex: Union[GoogleAdsException, grpc.RpcError]) -> bool:
+    call = ex.error if isinstance(ex, GoogleAdsException) else ex
+    code = call.code() if hasattr(call, "code") else None
+    if code is not None and code.name in RETRYABLE_STATUSES:
+        return True
+    if not isinstance(ex, GoogleAdsException):
+        return False
+    return any(error_code_kind(error) == "quota_error" for error in ex.failure.errors)
+
+
+def call_with_backoff(fn: Callable[[], T], customer_id: str) -> T:
+    """
+    Run a blocking Google Ads call with pacing, adaptive concurrency and retries.
+
+    ``fn`` must fully consume its response (e.g. ``list(stream)``) so a
+    retry never replays a half-read stream. Quota / transient errors, wrapped
+    in GoogleAdsException or raised as a bare grpc.RpcError, are
+    retried up to MAX_ATTEMPTS times with exponential backoff and jitter,
+    honouring the server's retry delay when one is given. Other errors
+    propagate unchanged.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        _pace_customer(customer_id)
+        _limiter.acquire()
+        started = time.monotonic()
+        throttled = False
+        try:
+            return fn()
+        except (GoogleAdsException, grpc.RpcError) as ex:
+            if not _is_retryable(ex) or attempt == MAX_ATTEMPTS - 1:
+                raise
+            throttled = True
+            delay = _retry_delay(ex) if isinstance(ex, GoogleAdsException) else None
+            delay = min(MAX_BACKOFF_SECONDS, delay or 2 ** attempt + random.random())
+        finally:
+            _limiter.release(time.monotonic() - started, throttled)
+
+        logger.warning(
+            f"Google Ads call for {customer_id} throttled, "
+            f"retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_ATTEMPTS})"
+        )
+        time.sleep(delay)
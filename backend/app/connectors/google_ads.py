@@ -5,20 +5,149 @@ Read-only connector for fetching Google Ads metrics.
 Uses google-ads Python library.
 """
 
+import asyncio
+import hashlib
+import itertools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
-from typing import Optional
+from typing import Callable, Iterator, Optional, TypeVar
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
-from google.protobuf import json_format
 
+from app.cache.ttl import MISSING, TTLCache
+from app.connectors._ratelimit import call_with_backoff, error_code_kind
 from app.connectors.base import BaseConnector
 from app.models.account import Platform
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Blocking gRPC calls run on this pool, never on the event loop thread
+_ads_pool = ThreadPoolExecutor(
+    max_workers=settings.google_ads_workers, thread_name_prefix="gads"
+)
+
+
+async def _run_blocking(fn: Callable[..., T], *args) -> T:
+    """Run a blocking Google Ads call on the shared ads thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_ads_pool, fn, *args)
+
+
+def shutdown_ads_pool() -> None:
+    """Stop the ads thread pool; called on application shutdown."""
+    _ads_pool.shutdown(wait=False, cancel_futures=True)
+
+# (GoogleAdsClient, GoogleAdsService) pairs keyed on (refresh token digest,
+# login customer). A shared client keeps its OAuth credentials, so only the
+# first call in ~50 minutes pays for the token refresh; google-auth refreshes
+# inline after that when the token expires. The service stub is built once
+# per client and expires with it.
+_client_cache = TTLCache(maxsize=256, ttl=3000)
+
+# Account currency keyed on customer ID. It never changes for an account,
+# so report queries leave it out instead of repeating it on every row.
+_currency_cache = TTLCache(maxsize=1024, ttl=86400)
+
+# Successful validate_connection probes keyed on (customer ID, refresh token
+# digest). Dropped early when a real call fails authentication.
+_validated_cache = TTLCache(maxsize=1024, ttl=300)
+_AUTH_ERRORS = {"authentication_error", "authorization_error"}
+
+# Strips the dashes from "123-456-7890" style customer IDs
+_DASH = str.maketrans("", "", "-")
+
+
+# Report queries are split into windows of this many days, each with an
+# explicit deadline, so a wide range never runs into DEADLINE_EXCEEDED
+REPORT_CHUNK_DAYS = 7
+REPORT_TIMEOUT_SECONDS = 120.0
+
+
+def _stream_rows(ga_service, customer_id: str, query: str) -> Iterator:
+    """
+    Run a GAQL query with search_stream and yield its rows.
+
+    Rows arrive in server-side batches as they are produced, instead of
+    search() paging through and buffering the whole result.
+    """
+    stream = ga_service.search_stream(
+        customer_id=customer_id, query=query, timeout=REPORT_TIMEOUT_SECONDS
+    )
+    for batch in stream:
+        yield from batch.results
+
+
+def _date_chunks(
+    date_from: date, date_to: date, days: int = REPORT_CHUNK_DAYS
+) -> Iterator[tuple[date, date]]:
+    """Split [date_from, date_to] into consecutive inclusive windows of ``days``."""
+    step = timedelta(days=days)
+    start = date_from
+    while start <= date_to:
+        end = min(start + step - timedelta(days=1), date_to)
+        yield start, end
+        start = end + timedelta(days=1)
+
+
+# GAQL report templates - built once; only the dates and the validated
+# campaign filter are interpolated per call
+_METRIC_FIELDS = (
+    "metrics.impressions, metrics.clicks, metrics.cost_micros, "
+    "metrics.conversions, metrics.conversions_value"
+)
+
+_CURRENCY_QUERY = "SELECT customer.currency_code FROM customer LIMIT 1"
+
+_ACCOUNT_METRICS_QUERY = (
+    "SELECT segments.date, " + _METRIC_FIELDS + " "
+    "FROM customer "
+    "WHERE segments.date BETWEEN '{date_from}' AND '{date_to}' "
+    "ORDER BY segments.date DESC"
+).format
+
+_CAMPAIGN_METRICS_QUERY = (
+    "SELECT segments.date, campaign.id, campaign.name, campaign.status, "
+    + _METRIC_FIELDS + " "
+    "FROM campaign "
+    "WHERE segments.date BETWEEN '{date_from}' AND '{date_to}'{campaign_filter} "
+    "ORDER BY segments.date DESC, campaign.name"
+).format
+
+_AD_GROUP_METRICS_QUERY = (
+    "SELECT segments.date, campaign.id, campaign.name, "
+    "ad_group.id, ad_group.name, ad_group.status, "
+    + _METRIC_FIELDS + " "
+    "FROM ad_group "
+    "WHERE segments.date BETWEEN '{date_from}' AND '{date_to}'{campaign_filter} "
+    "ORDER BY segments.date DESC, ad_group.name"
+).format
+
+
+def _campaign_filter(campaign_id: Optional[str]) -> str:
+    """GAQL campaign.id condition; the id must be numeric (injection guard)."""
+    if not campaign_id:
+        return ""
+    if not str(campaign_id).isdigit():
+        raise ValueError(f"Invalid Google Ads campaign id: {campaign_id!r}")
+    return f" AND campaign.id = {campaign_id}"
+
+
+def _search_rows(ga_service, customer_id: str, query: str) -> list:
+    """Stream a GAQL query through the shared rate limiter / retry policy."""
+    return call_with_backoff(
+        lambda: list(_stream_rows(ga_service, customer_id, query)),
+        customer_id,
+    )
+
+
+def _enum_names(client: GoogleAdsClient, enum_type: str, enum_name: str) -> Callable[[int], str]:
+    """Value -> name lookup for a Google Ads enum; raw protobuf rows carry ints."""
+    return getattr(client.get_type(enum_type), enum_name).Name
+
 
 class GoogleAdsConnector(BaseConnector):
     """
@@ -47,33 +176,61 @@ class GoogleAdsConnector(BaseConnector):
             login_customer_id: MCC account ID if using manager account
         """
         super().__init__(access_token, refresh_token, customer_id)
-        self.customer_id = customer_id.replace("-", "")
-        self.login_customer_id = login_customer_id.replace("-", "") if login_customer_id else None
+        self.customer_id = customer_id.translate(_DASH)
+        self.login_customer_id = login_customer_id.translate(_DASH) if login_customer_id else None
         self._client = None
+        self._ga_service = None
+        self._token_digest = hashlib.blake2b(
+            (refresh_token or "").encode(), digest_size=16
+        ).digest()
 
     def _get_client(self) -> GoogleAdsClient:
-        """Get or create Google Ads API client."""
+        """Get or create Google Ads API client, shared across instances."""
         if self._client is None:
+            cache_key = (self._token_digest, self.login_customer_id)
+            cached = _client_cache.get(cache_key)
+            if cached is not MISSING:
+                self._client, self._ga_service = cached
+                return self._client
+
             credentials = {
                 "developer_token": settings.google_ads_developer_token,
                 "client_id": settings.google_ads_client_id,
                 "client_secret": settings.google_ads_client_secret,
                 "refresh_token": self.refresh_token,
-                "use_proto_plus": True,
+                # Raw protobuf rows: proto-plus wraps every attribute
+                # access, which dominates parsing on large reports
+                "use_proto_plus": False,
             }
             
             if self.login_customer_id:
                 credentials["login_customer_id"] = self.login_customer_id
             
             self._client = GoogleAdsClient.load_from_dict(credentials)
+            self._ga_service = self._client.get_service("GoogleAdsService")
+            _client_cache.set(cache_key, (self._client, self._ga_service))
         
         return self._client
 
+    def _get_ga_service(self):
+        """GoogleAdsService stub for the (shared) client."""
+        if self._ga_service is None:
+            self._get_client()
+        return self._ga_service
+
+    def _on_api_error(self, ex: GoogleAdsException) -> None:
+        """Forget a cached successful validation once credentials are rejected."""
+        if any(error_code_kind(error) in _AUTH_ERRORS for error in ex.failure.errors):
+            _validated_cache.pop((self.customer_id, self._token_digest))
+
     async def validate_connection(self) -> bool:
-        """Validate that the connection is working."""
+        """Validate that the connection is working (cached for 5 minutes)."""
+        validation_key = (self.customer_id, self._token_digest)
+        if _validated_cache.get(validation_key) is not MISSING:
+            return True
+
         try:
-            client = self._get_client()
-            ga_service = client.get_service("GoogleAdsService")
+            ga_service = self._get_ga_service()
             
             # Simple query to test connection
             query = """
@@ -82,15 +239,16 @@ class GoogleAdsConnector(BaseConnector):
                 LIMIT 1
             """
             
-            response = ga_service.search(
-                customer_id=self.customer_id,
-                query=query,
+            response = await _run_blocking(
+                call_with_backoff,
+                lambda: list(ga_service.search(customer_id=self.customer_id, query=query)),
+                self.customer_id,
             )
             
             for row in response:
                 logger.info(f"Connected to Google Ads: {row.customer.descriptive_name}")
-                return True
             
+            _validated_cache.set(validation_key, True)
             return True
         except GoogleAdsException as ex:
             logger.error(f"Google Ads validation failed: {ex.failure.errors}")
@@ -113,8 +271,7 @@ class GoogleAdsConnector(BaseConnector):
     async def get_account_info(self) -> dict:
         """Get account name and details from Google Ads."""
         try:
-            client = self._get_client()
-            ga_service = client.get_service("GoogleAdsService")
+            ga_service = self._get_ga_service()
             
             query = """
                 SELECT 
@@ -126,9 +283,10 @@ class GoogleAdsConnector(BaseConnector):
                 LIMIT 1
             """
             
-            response = ga_service.search(
-                customer_id=self.customer_id,
-                query=query,
+            response = await _run_blocking(
+                call_with_backoff,
+                lambda: list(ga_service.search(customer_id=self.customer_id, query=query)),
+                self.customer_id,
             )
             
             for row in response:
@@ -142,6 +300,7 @@ class GoogleAdsConnector(BaseConnector):
             return {"id": self.customer_id, "name": f"Google Ads - {self.customer_id}"}
             
         except GoogleAdsException as ex:
+            self._on_api_error(ex)
             logger.error(f"Failed to get account info: {ex.failure.errors}")
             return {"id": self.customer_id, "name": f"Google Ads - {self.customer_id}"}
         except Exception as e:
@@ -151,8 +310,7 @@ class GoogleAdsConnector(BaseConnector):
     async def get_ad_accounts(self) -> list[dict]:
         """Get accessible Google Ads accounts (sub-accounts of the MCC)."""
         try:
-            client = self._get_client()
-            ga_service = client.get_service("GoogleAdsService")
+            ga_service = self._get_ga_service()
             
             # If we are an MCC (have login_customer_id), we should query the hierarchy
             # If not, we fall back to listing accessible customers
@@ -173,10 +331,7 @@ class GoogleAdsConnector(BaseConnector):
                 WHERE customer_client.status != 'CANCELED'
             """
             
-            response = ga_service.search(
-                customer_id=target_id,
-                query=query,
-            )
+            response = await _run_blocking(_search_rows, ga_service, target_id, query)
             
             accounts = []
             for row in response:
@@ -197,6 +352,7 @@ class GoogleAdsConnector(BaseConnector):
             return accounts
             
         except GoogleAdsException as ex:
+            self._on_api_error(ex)
             logger.error(f"Failed to get ad accounts: {ex.failure.errors}")
             return []
         except Exception as e:
@@ -207,7 +363,7 @@ class GoogleAdsConnector(BaseConnector):
         """Get campaigns for the account."""
         try:
             client = self._get_client()
-            ga_service = client.get_service("GoogleAdsService")
+            ga_service = self._get_ga_service()
             
             customer = account_id or self.customer_id
             
@@ -223,7 +379,11 @@ class GoogleAdsConnector(BaseConnector):
                 ORDER BY campaign.name
             """
             
-            response = ga_service.search(customer_id=customer, query=query)
+            response = await _run_blocking(_search_rows, ga_service, customer, query)
+            status_name = _enum_names(client, "CampaignStatusEnum", "CampaignStatus")
+            channel_name = _enum_names(
+                client, "AdvertisingChannelTypeEnum", "AdvertisingChannelType"
+            )
             
             campaigns = []
             for row in response:
@@ -231,8 +391,8 @@ class GoogleAdsConnector(BaseConnector):
                     "id": str(row.campaign.id),
                     "platform_id": str(row.campaign.id),
                     "name": row.campaign.name,
-                    "status": row.campaign.status.name.lower(),
-                    "channel_type": row.campaign.advertising_channel_type.name,
+                    "status": status_name(row.campaign.status).lower(),
+                    "channel_type": channel_name(row.campaign.advertising_channel_type),
                     "daily_budget_micros": row.campaign_budget.amount_micros,
                 })
             
@@ -240,6 +400,7 @@ class GoogleAdsConnector(BaseConnector):
             return campaigns
             
         except GoogleAdsException as ex:
+            self._on_api_error(ex)
             logger.error(f"Failed to get campaigns: {ex.failure.errors}")
             return []
         except Exception as e:
@@ -254,7 +415,7 @@ class GoogleAdsConnector(BaseConnector):
         """Get ad groups for campaigns."""
         try:
             client = self._get_client()
-            ga_service = client.get_service("GoogleAdsService")
+            ga_service = self._get_ga_service()
             
             customer = account_id or self.customer_id
             
@@ -269,12 +430,11 @@ class GoogleAdsConnector(BaseConnector):
                 WHERE ad_group.status != 'REMOVED'
             """
             
-            if campaign_id:
-                query += f" AND campaign.id = {campaign_id}"
-            
+            query += _campaign_filter(campaign_id)
             query += " ORDER BY ad_group.name"
             
-            response = ga_service.search(customer_id=customer, query=query)
+            response = await _run_blocking(_search_rows, ga_service, customer, query)
+            status_name = _enum_names(client, "AdGroupStatusEnum", "AdGroupStatus")
             
             ad_groups = []
             for row in response:
@@ -282,7 +442,7 @@ class GoogleAdsConnector(BaseConnector):
                     "id": str(row.ad_group.id),
                     "platform_id": str(row.ad_group.id),
                     "name": row.ad_group.name,
-                    "status": row.ad_group.status.name.lower(),
+                    "status": status_name(row.ad_group.status).lower(),
                     "campaign_id": row.ad_group.campaign.split("/")[-1],
                     "campaign_name": row.campaign.name,
                 })
@@ -290,6 +450,7 @@ class GoogleAdsConnector(BaseConnector):
             return ad_groups
             
         except GoogleAdsException as ex:
+            self._on_api_error(ex)
             logger.error(f"Failed to get ad groups: {ex.failure.errors}")
             return []
         except Exception as e:
@@ -303,6 +464,7 @@ class GoogleAdsConnector(BaseConnector):
         level: str = "campaign",
         account_id: Optional[str] = None,
         campaign_id: Optional[str] = None,
+        derived: bool = True,
     ) -> list[dict]:
         """
         Get performance metrics for a date range.
@@ -313,38 +475,33 @@ class GoogleAdsConnector(BaseConnector):
             level: Aggregation level (account, campaign, ad_group)
             account_id: Customer ID
             campaign_id: Filter by specific campaign
+            derived: Include ctr/cpc/cpm/roas/cpa. Callers that persist to
+                daily_metrics can skip them - the table generates those columns.
             
         Returns:
             List of normalized metric records
+        
+        Ranges longer than REPORT_CHUNK_DAYS are fetched as several
+        concurrent queries, each paced by the shared rate limiter.
         """
+        customer = account_id or self.customer_id
         try:
-            client = self._get_client()
-            ga_service = client.get_service("GoogleAdsService")
-            
-            customer = account_id or self.customer_id
-            
-            # Build query based on level
-            if level == "account":
-                query = self._build_account_metrics_query(date_from, date_to)
-            elif level == "ad_group":
-                query = self._build_ad_group_metrics_query(date_from, date_to, campaign_id)
-            else:  # campaign (default)
-                query = self._build_campaign_metrics_query(date_from, date_to, campaign_id)
-            
-            logger.info(f"Fetching {level} metrics for {customer} from {date_from} to {date_to}")
-            
-            response = ga_service.search(customer_id=customer, query=query)
-            
-            metrics = []
-            for row in response:
-                metric = self._parse_metrics_row(row, level)
-                if metric:
-                    metrics.append(metric)
-            
-            logger.info(f"Fetched {len(metrics)} metric records")
-            return metrics
-            
+            currency = _currency_cache.get(customer)
+            if currency is MISSING:
+                currency = await _run_blocking(self._fetch_currency, customer)
+                _currency_cache.set(customer, currency)
+
+            # The gRPC stream blocks - run each chunk off the event loop
+            results = await asyncio.gather(*(
+                _run_blocking(
+                    self._fetch_metrics,
+                    customer, start, end, level, campaign_id, currency, derived,
+                )
+                for start, end in _date_chunks(date_from, date_to)
+            ))
+            return list(itertools.chain.from_iterable(results))
         except GoogleAdsException as ex:
+            self._on_api_error(ex)
             for error in ex.failure.errors:
                 logger.error(f"Google Ads API error: {error.message}")
             return []
@@ -352,21 +509,58 @@ class GoogleAdsConnector(BaseConnector):
             logger.error(f"Error getting metrics: {e}", exc_info=True)
             return []
 
+    def _fetch_metrics(
+        self,
+        customer: str,
+        date_from: date,
+        date_to: date,
+        level: str,
+        campaign_id: Optional[str],
+        currency: str,
+        derived: bool = True,
+    ) -> list[dict]:
+        """Blocking metrics fetch for one customer; runs in a worker thread."""
+        client = self._get_client()
+        ga_service = self._get_ga_service()
+        
+        # Build query based on level
+        if level == "account":
+            query = self._build_account_metrics_query(date_from, date_to)
+        elif level == "ad_group":
+            query = self._build_ad_group_metrics_query(date_from, date_to, campaign_id)
+        else:  # campaign (default)
+            query = self._build_campaign_metrics_query(date_from, date_to, campaign_id)
+        
+        logger.info(f"Fetching {level} metrics for {customer} from {date_from} to {date_to}")
+        
+        response = _search_rows(ga_service, customer, query)
+        if level == "ad_group":
+            status_name = _enum_names(client, "AdGroupStatusEnum", "AdGroupStatus")
+        else:
+            status_name = _enum_names(client, "CampaignStatusEnum", "CampaignStatus")
+        
+        metrics = []
+        for row in response:
+            metric = self._parse_metrics_row(
+                row, level, status_name, customer, currency, derived
+            )
+            if metric:
+                metrics.append(metric)
+        
+        logger.info(f"Fetched {len(metrics)} metric records")
+        return metrics
+
+    def _fetch_currency(self, customer: str) -> str:
+        """Blocking lookup of the account currency; runs in a worker thread."""
+        rows = _search_rows(self._get_ga_service(), customer, _CURRENCY_QUERY)
+        return rows[0].customer.currency_code if rows else "TRY"
+
     def _build_account_metrics_query(self, date_from: date, date_to: date) -> str:
         """Build query for account-level metrics."""
-        return f"""
-            SELECT
-                segments.date,
-                metrics.impressions,
-                metrics.clicks,
-                metrics.cost_micros,
-                metrics.conversions,
-                metrics.conversions_value,
-                customer.currency_code
-            FROM customer
-            WHERE segments.date BETWEEN '{date_from.isoformat()}' AND '{date_to.isoformat()}'
-            ORDER BY segments.date DESC
-        """
+        return _ACCOUNT_METRICS_QUERY(
+            date_from=date_from.isoformat(),
+            date_to=date_to.isoformat(),
+        )
 
     def _build_campaign_metrics_query(
         self, 
@@ -375,27 +569,11 @@ class GoogleAdsConnector(BaseConnector):
         campaign_id: Optional[str] = None,
     ) -> str:
         """Build query for campaign-level metrics."""
-        query = f"""
-            SELECT
-                segments.date,
-                campaign.id,
-                campaign.name,
-                campaign.status,
-                metrics.impressions,
-                metrics.clicks,
-                metrics.cost_micros,
-                metrics.conversions,
-                metrics.conversions_value,
-                customer.currency_code
-            FROM campaign
-            WHERE segments.date BETWEEN '{date_from.isoformat()}' AND '{date_to.isoformat()}'
-        """
-        
-        if campaign_id:
-            query += f" AND campaign.id = {campaign_id}"
-        
-        query += " ORDER BY segments.date DESC, campaign.name"
-        return query
+        return _CAMPAIGN_METRICS_QUERY(
+            date_from=date_from.isoformat(),
+            date_to=date_to.isoformat(),
+            campaign_filter=_campaign_filter(campaign_id),
+        )
 
     def _build_ad_group_metrics_query(
         self,
@@ -404,96 +582,79 @@ class GoogleAdsConnector(BaseConnector):
         campaign_id: Optional[str] = None,
     ) -> str:
         """Build query for ad group-level metrics."""
-        query = f"""
-            SELECT
-                segments.date,
-                campaign.id,
-                campaign.name,
-                ad_group.id,
-                ad_group.name,
-                ad_group.status,
-                metrics.impressions,
-                metrics.clicks,
-                metrics.cost_micros,
-                metrics.conversions,
-                metrics.conversions_value,
-                customer.currency_code
-            FROM ad_group
-            WHERE segments.date BETWEEN '{date_from.isoformat()}' AND '{date_to.isoformat()}'
-        """
-        
-        if campaign_id:
-            query += f" AND campaign.id = {campaign_id}"
-        
-        query += " ORDER BY segments.date DESC, ad_group.name"
-        return query
+        return _AD_GROUP_METRICS_QUERY(
+            date_from=date_from.isoformat(),
+            date_to=date_to.isoformat(),
+            campaign_filter=_campaign_filter(campaign_id),
+        )
 
-    def _parse_metrics_row(self, row, level: str) -> Optional[dict]:
-        """Parse a metrics row into normalized format."""
+    def _parse_metrics_row(
+        self,
+        row,
+        level: str,
+        status_name: Callable[[int], str],
+        customer: str,
+        currency: str,
+        derived: bool = True,
+    ) -> Optional[dict]:
+        """Parse a raw protobuf metrics row into normalized format."""
         try:
+            m = row.metrics
+            impressions = m.impressions
+            clicks = m.clicks
             # Convert micros to actual currency (database stores in TRY, not micros)
-            spend = row.metrics.cost_micros / 1_000_000 if row.metrics.cost_micros else 0
-            conversion_value = row.metrics.conversions_value if row.metrics.conversions_value else 0
+            spend = m.cost_micros / 1_000_000
+            conversions = int(m.conversions)
+            conversion_value = m.conversions_value
 
-            base_metrics = {
-                "date": str(row.segments.date),
+            metrics = {
+                "date": row.segments.date,
                 "platform": "google_ads",
-                "impressions": row.metrics.impressions,
-                "clicks": row.metrics.clicks,
+                "impressions": impressions,
+                "clicks": clicks,
                 "spend": spend,  # Database uses 'spend' column (numeric in TRY)
-                "conversions": int(row.metrics.conversions),
+                "conversions": conversions,
                 "conversion_value": conversion_value,  # Database uses 'conversion_value' column
-                "currency": row.customer.currency_code,
+                "currency": currency,
             }
 
-            # Add CTR, CPC, etc.
-            if base_metrics["impressions"] > 0:
-                base_metrics["ctr"] = base_metrics["clicks"] / base_metrics["impressions"]
-            else:
-                base_metrics["ctr"] = 0.0
-
-            if base_metrics["clicks"] > 0:
-                base_metrics["cpc"] = base_metrics["spend"] / base_metrics["clicks"]
-            else:
-                base_metrics["cpc"] = 0
-
-            if base_metrics["impressions"] > 0:
-                base_metrics["cpm"] = (base_metrics["spend"] / base_metrics["impressions"]) * 1000
-            else:
-                base_metrics["cpm"] = 0
-
-            if base_metrics["spend"] > 0 and base_metrics["conversion_value"] > 0:
-                base_metrics["roas"] = base_metrics["conversion_value"] / base_metrics["spend"]
-            else:
-                base_metrics["roas"] = 0.0
-
-            if base_metrics["conversions"] > 0:
-                base_metrics["cpa"] = base_metrics["spend"] / base_metrics["conversions"]
-            else:
-                base_metrics["cpa"] = 0
+            # Add CTR, CPC, etc. - a zero denominator yields 0
+            if derived:
+                metrics.update(
+                    ctr=clicks / impressions if impressions else 0.0,
+                    cpc=spend / clicks if clicks else 0.0,
+                    cpm=spend * 1000 / impressions if impressions else 0.0,
+                    roas=conversion_value / spend if spend else 0.0,
+                    cpa=spend / conversions if conversions else 0.0,
+                )
 
             # Add level-specific fields
             if level == "campaign":
-                base_metrics["entity_type"] = "campaign"
-                base_metrics["entity_id"] = str(row.campaign.id)
-                base_metrics["entity_name"] = row.campaign.name
-                base_metrics["campaign_id"] = str(row.campaign.id)
-                base_metrics["campaign_name"] = row.campaign.name
-                base_metrics["campaign_status"] = row.campaign.status.name.lower()
+                campaign_id = str(row.campaign.id)
+                metrics.update(
+                    entity_type="campaign",
+                    entity_id=campaign_id,
+                    entity_name=row.campaign.name,
+                    campaign_id=campaign_id,
+                    campaign_name=row.campaign.name,
+                    campaign_status=status_name(row.campaign.status).lower(),
+                )
             elif level == "ad_group":
-                base_metrics["entity_type"] = "ad_group"
-                base_metrics["entity_id"] = str(row.ad_group.id)
-                base_metrics["entity_name"] = row.ad_group.name
-                base_metrics["campaign_id"] = str(row.campaign.id)
-                base_metrics["campaign_name"] = row.campaign.name
-                base_metrics["ad_set_id"] = str(row.ad_group.id)
-                base_metrics["ad_set_name"] = row.ad_group.name
-                base_metrics["ad_set_status"] = row.ad_group.status.name.lower()
+                ad_group_id = str(row.ad_group.id)
+                metrics.update(
+                    entity_type="ad_group",
+                    entity_id=ad_group_id,
+                    entity_name=row.ad_group.name,
+                    campaign_id=str(row.campaign.id),
+                    campaign_name=row.campaign.name,
+                    ad_set_id=ad_group_id,
+                    ad_set_name=row.ad_group.name,
+                    ad_set_status=status_name(row.ad_group.status).lower(),
+                )
             else:
-                base_metrics["entity_type"] = "account"
-                base_metrics["entity_id"] = self.customer_id
+                metrics.update(entity_type="account", entity_id=customer)
 
-            return base_metrics
+            return metrics
 
         except Exception as e:
             logger.error(f"Error parsing metrics row: {e}")
@@ -5,7 +5,12 @@ Core utilities and configuration.
 """
 
 from app.core.config import settings, get_settings
-from app.core.supabase import get_supabase_client, get_supabase_service, SupabaseService
+from app.core.supabase import (
+    create_supabase_client,
+    get_supabase_client,
+    get_supabase_service,
+    SupabaseService,
+)
 from app.core.security import (
     encrypt_token,
     decrypt_token,
@@ -22,6 +27,7 @@ __all__ = [
     "settings",
     "get_settings",
     # Supabase
+    "create_supabase_client",
     "get_supabase_client",
     "get_supabase_service",
     "SupabaseService",
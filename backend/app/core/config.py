@@ -3,7 +3,7 @@ Ad Platform MVP - Application Settings
 Centralized configuration using Pydantic Settings.
 """
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import List, Optional, Union
 from pydantic import AnyHttpUrl, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -44,6 +44,8 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 60 * 24 * 8  # 8 gün
     encryption_key: str  # 64 hex characters
+    # bcrypt cost for hash_password; existing hashes keep their own cost
+    bcrypt_rounds: int = 10
 
     # ===========================================
     # GOOGLE ADS (Opsiyonel - Çökmemesi için)
@@ -52,6 +54,8 @@ class Settings(BaseSettings):
     google_ads_client_secret: Optional[str] = None
     google_ads_developer_token: Optional[str] = None
     google_ads_redirect_uri: str = "http://localhost:8000/api/v1/auth/google/callback"
+    # Threads for blocking Google Ads gRPC calls (shared per process)
+    google_ads_workers: int = 32
 
     # ===========================================
     # META ADS (Opsiyonel)
@@ -98,7 +102,7 @@ class Settings(BaseSettings):
             raise ValueError("ENCRYPTION_KEY must be 64 hex characters")
         return v
 
-    @property
+    @cached_property
     def encryption_key_bytes(self) -> bytes:
         return bytes.fromhex(self.encryption_key)
 
@@ -6,22 +6,24 @@ Uses AES-256-GCM for encrypting OAuth tokens at rest.
 """
 
 import base64
+import hashlib
+import hmac
 import os
 import secrets
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
+import bcrypt
+import jwt
+import orjson
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jwt.exceptions import InvalidTokenError as JWTError
 
+from app.cache.ttl import MISSING, TTLCache
 from app.core.config import settings
 
 
-# Password hashing context (if needed for API keys, etc.)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
 # ===========================================
 # AES-256-GCM TOKEN ENCRYPTION
 # ===========================================
@@ -65,7 +67,7 @@ class TokenEncryption:
         )
         
         # Combine nonce + ciphertext and base64 encode
-        encrypted = base64.b64encode(nonce + ciphertext).decode("utf-8")
+        encrypted = base64.b64encode(nonce + ciphertext).decode("ascii")
         return encrypted
 
     def decrypt(self, encrypted: str) -> str:
@@ -82,10 +84,10 @@ class TokenEncryption:
             ValueError: If decryption fails (tampering or wrong key)
         """
         try:
-            # Decode from base64
-            data = base64.b64decode(encrypted.encode("utf-8"))
+            # Decode from base64 (b64decode takes the ASCII str as is)
+            data = memoryview(base64.b64decode(encrypted, validate=True))
             
-            # Extract nonce (first 12 bytes) and ciphertext
+            # Extract nonce (first 12 bytes) and ciphertext as zero-copy views
             nonce = data[:12]
             ciphertext = data[12:]
             
@@ -100,6 +102,11 @@ class TokenEncryption:
 # Singleton instance
 _token_encryption = TokenEncryption()
 
+# Decrypted tokens keyed on a digest of the ciphertext, so the ciphertext
+# itself is not held. A rotated token is stored as a new ciphertext, so
+# stale entries are never hit again and simply expire.
+_decrypt_cache = TTLCache(maxsize=4096, ttl=900)
+
 
 def encrypt_token(token: str) -> str:
     """Encrypt an OAuth token for storage."""
@@ -107,14 +114,44 @@ def encrypt_token(token: str) -> str:
 
 
 def decrypt_token(encrypted_token: str) -> str:
-    """Decrypt an OAuth token from storage."""
-    return _token_encryption.decrypt(encrypted_token)
+    """Decrypt an OAuth token from storage (cached for 15 minutes)."""
+    key = hashlib.blake2b(encrypted_token.encode(), digest_size=16).digest()
+    token = _decrypt_cache.get(key)
+    if token is MISSING:
+        token = _token_encryption.decrypt(encrypted_token)
+        _decrypt_cache.set(key, token)
+    return token
 
 
 # ===========================================
 # JWT TOKEN HANDLING
 # ===========================================
 
+# Verified payloads keyed on a digest of the token, kept for at most
+# JWT_CACHE_SECONDS and never past the token's own expiry
+JWT_CACHE_SECONDS = 60
+_jwt_cache = TTLCache(maxsize=8192, ttl=JWT_CACHE_SECONDS)
+
+# HS* tokens are signed here directly: the header never changes, so its
+# encoding and the keyed HMAC state are built once and copied per token.
+# Other algorithms go through jwt.encode.
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url, as used by JWS."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+_JWT_HEADER = _b64url(orjson.dumps({"alg": settings.jwt_algorithm, "typ": "JWT"})) + b"."
+_jwt_digest = _HMAC_DIGESTS.get(settings.jwt_algorithm)
+_jwt_hmac = (
+    hmac.new(settings.jwt_secret_key.encode(), digestmod=_jwt_digest)
+    if _jwt_digest is not None
+    else None
+)
+
+
 def create_access_token(
     data: dict[str, Any],
     expires_delta: Optional[timedelta] = None
@@ -138,14 +175,19 @@ def create_access_token(
             minutes=settings.jwt_expire_minutes
         )
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": int(expire.timestamp())})
     
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.jwt_secret_key,
-        algorithm=settings.jwt_algorithm
-    )
-    return encoded_jwt
+    if _jwt_hmac is None:
+        return jwt.encode(
+            to_encode,
+            settings.jwt_secret_key,
+            algorithm=settings.jwt_algorithm
+        )
+    
+    signing_input = _JWT_HEADER + _b64url(orjson.dumps(to_encode, default=str))
+    mac = _jwt_hmac.copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + _b64url(mac.digest())).decode("ascii")
 
 
 def decode_access_token(token: str) -> Optional[dict[str, Any]]:
@@ -158,16 +200,26 @@ def decode_access_token(token: str) -> Optional[dict[str, Any]]:
     Returns:
         Decoded payload dict or None if invalid
     """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _jwt_cache.get(key)
+    if payload is not MISSING:
+        return payload
+
     try:
         payload = jwt.decode(
             token,
             settings.jwt_secret_key,
-            algorithms=[settings.jwt_algorithm]
+            algorithms=[settings.jwt_algorithm],
+            options={"require": ["exp"]},
         )
-        return payload
     except JWTError:
         return None
 
+    ttl = min(JWT_CACHE_SECONDS, payload.get("exp", 0) - time.time())
+    if ttl > 0:
+        _jwt_cache.set(key, payload, ttl=ttl)
+    return payload
+
 
 def verify_token(token: str) -> Optional[str]:
     """
@@ -201,7 +253,7 @@ def generate_oauth_state() -> str:
     Returns:
         URL-safe random string (32 characters)
     """
-    return secrets.token_urlsafe(24)
+    return _b64url(os.urandom(24)).decode("ascii")
 
 
 def create_oauth_state_token(
@@ -227,7 +279,7 @@ def create_oauth_state_token(
         "sub": user_id,
         "platform": platform,
         "redirect_uri": redirect_uri,
-        "nonce": secrets.token_hex(8),
+        "nonce": os.urandom(8).hex(),
     }
     
     # Short expiration for OAuth state (10 minutes)
@@ -248,17 +300,43 @@ def decode_oauth_state_token(state: str) -> Optional[dict[str, Any]]:
 
 
 # ===========================================
-# PASSWORD UTILITIES (for API keys, etc.)
+# PASSWORD / API KEY UTILITIES
 # ===========================================
 
+# bcrypt only reads the first 72 bytes; bcrypt>=5 raises ValueError for
+# longer input instead of ignoring the rest, so truncate explicitly
+_BCRYPT_MAX_BYTES = 72
+
+
+def _password_bytes(password: str) -> bytes:
+    """UTF-8 encode a password and cut it to bcrypt's 72-byte limit."""
+    return password.encode("utf-8")[:_BCRYPT_MAX_BYTES]
+
+
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
+    return bcrypt.hashpw(_password_bytes(password), salt).decode("utf-8")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(_password_bytes(plain_password), hashed_password.encode("utf-8"))
+
+
+def hash_api_key(api_key: str) -> str:
+    """
+    Hash an API key for storage.
+    
+    Keys are 256-bit random tokens, so a single SHA-256 is enough;
+    bcrypt's work factor only helps against guessable passwords.
+    """
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+def verify_api_key(plain_api_key: str, hashed_api_key: str) -> bool:
+    """Verify an API key against its stored hash in constant time."""
+    return hmac.compare_digest(hash_api_key(plain_api_key), hashed_api_key)
 
 
 def generate_api_key() -> tuple[str, str]:
@@ -271,5 +349,4 @@ def generate_api_key() -> tuple[str, str]:
         - hashed_api_key: Store in database
     """
     api_key = secrets.token_urlsafe(32)
-    hashed = hash_password(api_key)
-    return api_key, hashed
+    return api_key, hash_api_key(api_key)
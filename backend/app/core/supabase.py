@@ -5,20 +5,45 @@ Supabase client initialization for backend operations.
 Uses service_role key which bypasses RLS for admin operations.
 """
 
-from typing import Optional
+import asyncio
+from typing import AsyncIterator, Optional
 
+from postgrest import AsyncPostgrestClient
+from postgrest.types import ReturnMethod
 from supabase import create_client, Client
 
 from app.core.config import settings
 
 
-def get_supabase_client() -> Client:
+# PostgREST caps responses at max-rows (1000 on Supabase); daily_metrics
+# reads page through with Range requests of this size
+DAILY_METRICS_PAGE_SIZE = 1000
+
+# daily_metrics writes go out in chunks of this many rows, at most
+# DAILY_METRICS_WRITE_CONCURRENCY at a time, so a large sync stays under
+# PostgREST's request size / statement timeout and a failure only costs a chunk
+DAILY_METRICS_WRITE_CHUNK = 500
+DAILY_METRICS_WRITE_CONCURRENCY = 8
+
+# Insights are always read with their actions embedded (one server-side join)
+INSIGHT_WITH_ACTIONS_SELECT = "*, recommended_actions(*)"
+
+# Users are always read with their organization embedded
+USER_WITH_ORG_SELECT = "*, organizations(*)"
+
+
+def create_supabase_client() -> Client:
     """
     Create a fresh Supabase client instance.
 
     Uses service_role key for backend operations.
     This bypasses Row Level Security - use carefully!
 
+    Response compression is negotiated by httpx itself: it sends
+    Accept-Encoding gzip/deflate, plus br when brotli is installed (see
+    requirements.txt), and decodes transparently. Don't hard-code the
+    header here - advertising an encoding httpx can't decode breaks reads.
+
     Returns:
         Supabase client instance
     """
@@ -28,11 +53,70 @@ def get_supabase_client() -> Client:
     )
 
 
+_shared_client: Optional[Client] = None
+
+
+def get_supabase_client() -> Client:
+    """
+    Get the process-wide service_role Supabase client.
+
+    Built on first use and shared afterwards, so its httpx connection
+    pool is reused. Never sign users in on this client: supabase-py then
+    swaps the service_role key for the user's JWT on every later query.
+    Use create_supabase_client() for that.
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = create_supabase_client()
+    return _shared_client
+
+
+# Async PostgREST client (httpx.AsyncClient underneath) and the event loop it
+# belongs to. Pooled connections can't cross loops, and Celery tasks run
+# each job under a fresh loop (app.tasks.run_async), so a new loop gets a
+# new client; run_async closes it before its loop goes away.
+_rest_client: Optional[tuple[asyncio.AbstractEventLoop, AsyncPostgrestClient]] = None
+
+
+def get_rest_client() -> AsyncPostgrestClient:
+    """
+    Get the async PostgREST client for the running event loop.
+
+    Same query builder as the sync client, but ``execute()`` is awaited,
+    so database calls no longer block the event loop.
+    """
+    global _rest_client
+    loop = asyncio.get_running_loop()
+    if _rest_client is None or _rest_client[0] is not loop:
+        key = settings.supabase_service_role_key
+        _rest_client = (loop, AsyncPostgrestClient(
+            f"{settings.supabase_url}/rest/v1",
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+                "apikey": key,
+                "Authorization": f"Bearer {key}",
+            },
+        ))
+    return _rest_client[1]
+
+
+async def close_rest_client() -> None:
+    """Close the async PostgREST client; called on application shutdown."""
+    global _rest_client
+    if _rest_client is not None:
+        _, client = _rest_client
+        _rest_client = None
+        await client.aclose()
+
+
 class SupabaseService:
     """
     Service wrapper for Supabase operations.
 
-    Provides typed methods for common database operations.
+    Provides typed methods for common database operations. They run on
+    the async PostgREST client; ``client`` is the sync Supabase client for
+    callers that still build their own queries.
     """
 
     def __init__(self, client: Optional[Client] = None):
@@ -40,16 +124,21 @@ class SupabaseService:
 
     @property
     def client(self) -> Client:
-        """Get the Supabase client."""
+        """Get the (sync) Supabase client."""
         return self._client
 
+    @property
+    def db(self) -> AsyncPostgrestClient:
+        """Get the async PostgREST client used by the service methods."""
+        return get_rest_client()
+
     # ===========================================
     # ORGANIZATION OPERATIONS
     # ===========================================
 
     async def get_organization(self, org_id: str) -> Optional[dict]:
         """Get organization by ID."""
-        result = self._client.table("organizations") \
+        result = await self.db.table("organizations") \
             .select("*") \
             .eq("id", org_id) \
             .limit(1) \
@@ -58,7 +147,7 @@ class SupabaseService:
 
     async def get_organization_by_slug(self, slug: str) -> Optional[dict]:
         """Get organization by slug."""
-        result = self._client.table("organizations") \
+        result = await self.db.table("organizations") \
             .select("*") \
             .eq("slug", slug) \
             .limit(1) \
@@ -71,8 +160,8 @@ class SupabaseService:
 
     async def get_user(self, user_id: str) -> Optional[dict]:
         """Get user by ID. Returns None if not found (no PGRST116 error)."""
-        result = self._client.table("users") \
-            .select("*, organizations(*)") \
+        result = await self.db.table("users") \
+            .select(USER_WITH_ORG_SELECT) \
             .eq("id", user_id) \
             .limit(1) \
             .execute()
@@ -80,17 +169,17 @@ class SupabaseService:
 
     async def get_user_by_email(self, email: str) -> Optional[dict]:
         """Get user by email. Returns None if not found."""
-        result = self._client.table("users") \
-            .select("*, organizations(*)") \
+        result = await self.db.table("users") \
+            .select(USER_WITH_ORG_SELECT) \
             .eq("email", email) \
             .limit(1) \
             .execute()
         return result.data[0] if result.data else None
 
     async def update_user_last_seen(self, user_id: str) -> None:
-        """Update user's last_seen_at timestamp."""
-        self._client.table("users") \
-            .update({"last_seen_at": "now()"}) \
+        """Update user's last_seen_at timestamp (no row sent back)."""
+        await self.db.table("users") \
+            .update({"last_seen_at": "now()"}, returning=ReturnMethod.minimal) \
             .eq("id", user_id) \
             .execute()
 
@@ -105,7 +194,7 @@ class SupabaseService:
         is_active: bool = True
     ) -> list[dict]:
         """Get connected accounts for an organization."""
-        query = self._client.table("connected_accounts") \
+        query = self.db.table("connected_accounts") \
             .select("*") \
             .eq("org_id", org_id) \
             .eq("is_active", is_active)
@@ -113,37 +202,64 @@ class SupabaseService:
         if platform:
             query = query.eq("platform", platform)
 
-        result = query.execute()
+        result = await query.execute()
         return result.data
 
     async def get_connected_account(self, account_id: str) -> Optional[dict]:
         """Get a specific connected account. Returns None if not found."""
-        result = self._client.table("connected_accounts") \
+        result = await self.db.table("connected_accounts") \
             .select("*") \
             .eq("id", account_id) \
             .limit(1) \
             .execute()
         return result.data[0] if result.data else None
 
+    async def get_connected_account_id(
+        self,
+        org_id: str,
+        platform: str,
+        platform_account_id: str,
+    ) -> Optional[str]:
+        """ID of the connected account with this natural key, if one exists."""
+        result = await self.db.table("connected_accounts") \
+            .select("id") \
+            .eq("org_id", org_id) \
+            .eq("platform", platform) \
+            .eq("platform_account_id", platform_account_id) \
+            .limit(1) \
+            .execute()
+        return result.data[0]["id"] if result.data else None
+
     async def create_connected_account(self, data: dict) -> dict:
-        """Create a new connected account."""
-        result = self._client.table("connected_accounts") \
-            .insert(data) \
+        """
+        Create or refresh a connected account.
+
+        Upserts on (org_id, platform, platform_account_id) so re-running
+        OAuth for the same account updates its tokens in a single write.
+        Leave ``id`` out of ``data`` for an existing row: the conflict
+        update would otherwise rewrite the primary key that campaigns and
+        daily_metrics reference.
+        """
+        result = await self.db.table("connected_accounts") \
+            .upsert(data, on_conflict="org_id,platform,platform_account_id") \
             .execute()
         return result.data[0]
 
     async def update_connected_account(self, account_id: str, data: dict) -> dict:
         """Update a connected account."""
-        result = self._client.table("connected_accounts") \
+        result = await self.db.table("connected_accounts") \
             .update(data) \
             .eq("id", account_id) \
             .execute()
         return result.data[0]
 
     async def deactivate_connected_account(self, account_id: str) -> None:
-        """Soft delete a connected account."""
-        self._client.table("connected_accounts") \
-            .update({"is_active": False, "status": "disconnected"}) \
+        """Soft delete a connected account (no row sent back)."""
+        await self.db.table("connected_accounts") \
+            .update(
+                {"is_active": False, "status": "disconnected"},
+                returning=ReturnMethod.minimal,
+            ) \
             .eq("id", account_id) \
             .execute()
 
@@ -157,7 +273,7 @@ class SupabaseService:
         is_active: bool = True
     ) -> list[dict]:
         """Get campaigns for an account."""
-        query = self._client.table("campaigns") \
+        query = self.db.table("campaigns") \
             .select("*") \
             .eq("account_id", account_id)
 
@@ -165,12 +281,31 @@ class SupabaseService:
         if is_active:
             query = query.neq("status", "removed")
 
-        result = query.order("name").execute()
+        result = await query.order("name").execute()
+        return result.data
+
+    async def get_campaigns_for_accounts(
+        self,
+        account_ids: list[str],
+        is_active: bool = True
+    ) -> list[dict]:
+        """Get campaigns for several accounts in a single query."""
+        if not account_ids:
+            return []
+
+        query = self.db.table("campaigns") \
+            .select("*") \
+            .in_("account_id", account_ids)
+
+        if is_active:
+            query = query.neq("status", "removed")
+
+        result = await query.order("name").execute()
         return result.data
 
     async def upsert_campaign(self, data: dict) -> dict:
         """Upsert a campaign (insert or update)."""
-        result = self._client.table("campaigns") \
+        result = await self.db.table("campaigns") \
             .upsert(data, on_conflict="account_id,platform_campaign_id") \
             .execute()
         return result.data[0]
@@ -180,16 +315,30 @@ class SupabaseService:
     # ===========================================
 
     async def upsert_daily_metrics(self, records: list[dict]) -> list[dict]:
-        """Bulk upsert daily metrics."""
-        import logging
-        logger = logging.getLogger(__name__)
-
+        """Bulk upsert daily metrics in concurrent chunks."""
         if not records:
             return []
 
+        semaphore = asyncio.Semaphore(DAILY_METRICS_WRITE_CONCURRENCY)
+
+        async def write(chunk: list[dict]) -> list[dict]:
+            async with semaphore:
+                return await self._write_daily_metrics_chunk(chunk)
+
+        results = await asyncio.gather(*(
+            write(records[i:i + DAILY_METRICS_WRITE_CHUNK])
+            for i in range(0, len(records), DAILY_METRICS_WRITE_CHUNK)
+        ))
+        return [row for rows in results for row in rows]
+
+    async def _write_daily_metrics_chunk(self, records: list[dict]) -> list[dict]:
+        """Insert one chunk of daily metrics, falling back to upsert."""
+        import logging
+        logger = logging.getLogger(__name__)
+
         # Try simple insert first
         try:
-            result = self._client.table("daily_metrics").insert(records).execute()
+            result = await self.db.table("daily_metrics").insert(records).execute()
             logger.info(f"Inserted {len(result.data)} daily metrics")
             return result.data
         except Exception as e:
@@ -197,7 +346,7 @@ class SupabaseService:
 
             # Fallback to upsert
             try:
-                result = self._client.table("daily_metrics").upsert(records).execute()
+                result = await self.db.table("daily_metrics").upsert(records).execute()
                 logger.info(f"Upserted {len(result.data)} daily metrics")
                 return result.data
             except Exception as e2:
@@ -211,31 +360,152 @@ class SupabaseService:
         date_to: str,
         account_id: Optional[str] = None,
         campaign_id: Optional[str] = None,
-        include_inactive_accounts: bool = False
+        include_inactive_accounts: bool = False,
+        columns: str = "*",
     ) -> list[dict]:
         """Get daily metrics with filters using efficient DB join."""
+        rows = []
+        async for page in self.iter_daily_metrics(
+            org_id=org_id,
+            date_from=date_from,
+            date_to=date_to,
+            account_id=account_id,
+            campaign_id=campaign_id,
+            include_inactive_accounts=include_inactive_accounts,
+            columns=columns,
+        ):
+            rows.extend(page)
+        return rows
+
+    async def iter_daily_metrics(
+        self,
+        org_id: str,
+        date_from: str,
+        date_to: str,
+        account_id: Optional[str] = None,
+        campaign_id: Optional[str] = None,
+        include_inactive_accounts: bool = False,
+        columns: str = "*",
+        page_size: int = DAILY_METRICS_PAGE_SIZE,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Yield daily metrics one page at a time, newest first.
+
+        Callers can fold each page into their aggregates instead of holding
+        the whole range in memory. Ordered by (date, id) so pages don't
+        overlap or skip rows. ``columns`` is the PostgREST select list for
+        daily_metrics; pass only what the caller reads to shrink payloads.
+        """
+
+        def _query():
+            # range() mutates the builder and appends another offset/limit
+            # pair, so every page starts from a fresh query.
+            # 'connected_accounts' tablosu ile inner join yaparak sadece
+            # ilgili org_id'ye ait hesapların verilerini çekiyoruz.
+            # Default olarak sadece aktif hesapların metriklerini gösteriyoruz.
+            query = self.db.table("daily_metrics") \
+                .select(f"{columns}, connected_accounts!inner(org_id, is_active)") \
+                .eq("connected_accounts.org_id", org_id) \
+                .gte("date", date_from) \
+                .lte("date", date_to)
+
+            # Sadece aktif hesapların metriklerini göster (varsayılan davranış)
+            if not include_inactive_accounts:
+                query = query.eq("connected_accounts.is_active", True)
+
+            if account_id:
+                query = query.eq("account_id", account_id)
+
+            if campaign_id:
+                query = query.eq("campaign_id", campaign_id)
+
+            return query.order("date", desc=True).order("id")
+
+        start = 0
+        while True:
+            result = await _query().range(start, start + page_size - 1).execute()
+            page = result.data or []
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            start += page_size
+
+    async def get_campaign_metrics_agg(
+        self,
+        org_id: str,
+        date_from: str,
+        date_to: str,
+        account_id: Optional[str] = None,
+        platform: Optional[str] = None,
+        sort_by: str = "spend",
+        sort_desc: bool = True,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[dict]:
+        """Get one page of per-campaign totals via the campaign_metrics_agg RPC."""
+        result = await self.db.rpc("campaign_metrics_agg", {
+            "p_org": org_id,
+            "p_from": date_from,
+            "p_to": date_to,
+            "p_account": account_id,
+            "p_platform": platform,
+            "p_sort": sort_by,
+            "p_desc": sort_desc,
+            "p_limit": limit,
+            "p_offset": offset,
+        }).execute()
+        return result.data or []
 
-        # 'connected_accounts' tablosu ile inner join yaparak sadece
-        # ilgili org_id'ye ait hesapların verilerini çekiyoruz.
-        # Default olarak sadece aktif hesapların metriklerini gösteriyoruz.
-        query = self._client.table("daily_metrics") \
-            .select("*, connected_accounts!inner(org_id, is_active)") \
-            .eq("connected_accounts.org_id", org_id) \
-            .gte("date", date_from) \
-            .lte("date", date_to)
-
-        # Sadece aktif hesapların metriklerini göster (varsayılan davranış)
-        if not include_inactive_accounts:
-            query = query.eq("connected_accounts.is_active", True)
-
-        if account_id:
-            query = query.eq("account_id", account_id)
+    async def get_metrics_summary_agg(
+        self,
+        org_id: str,
+        date_from: str,
+        date_to: str,
+        account_id: Optional[str] = None,
+        platform: Optional[str] = None,
+    ) -> dict:
+        """Get period totals and distinct counts via the metrics_summary RPC."""
+        result = await self.db.rpc("metrics_summary", {
+            "p_org": org_id,
+            "p_from": date_from,
+            "p_to": date_to,
+            "p_account": account_id,
+            "p_platform": platform,
+        }).execute()
+        return result.data[0] if result.data else {}
 
-        if campaign_id:
-            query = query.eq("campaign_id", campaign_id)
+    async def get_metrics_daily_agg(
+        self,
+        org_id: str,
+        date_from: str,
+        date_to: str,
+        account_id: Optional[str] = None,
+    ) -> list[dict]:
+        """Get per-day totals via the metrics_daily RPC."""
+        result = await self.db.rpc("metrics_daily", {
+            "p_org": org_id,
+            "p_from": date_from,
+            "p_to": date_to,
+            "p_account": account_id,
+        }).execute()
+        return result.data or []
 
-        result = query.order("date", desc=True).execute()
-        return result.data
+    async def get_metrics_by_platform_agg(
+        self,
+        org_id: str,
+        date_from: str,
+        date_to: str,
+        account_id: Optional[str] = None,
+    ) -> list[dict]:
+        """Get per-platform totals and distinct counts via the metrics_by_platform RPC."""
+        result = await self.db.rpc("metrics_by_platform", {
+            "p_org": org_id,
+            "p_from": date_from,
+            "p_to": date_to,
+            "p_account": account_id,
+        }).execute()
+        return result.data or []
 
     # ===========================================
     # INSIGHTS OPERATIONS
@@ -243,7 +513,7 @@ class SupabaseService:
 
     async def create_insight(self, data: dict) -> dict:
         """Create a new insight."""
-        result = self._client.table("insights") \
+        result = await self.db.table("insights") \
             .insert(data) \
             .execute()
         return result.data[0]
@@ -252,29 +522,198 @@ class SupabaseService:
         self,
         org_id: str,
         is_read: Optional[bool] = None,
-        limit: int = 20
+        limit: int = 20,
+        insight_type: Optional[str] = None,
+        severity: Optional[str] = None,
+        is_dismissed: bool = False,
     ) -> list[dict]:
         """Get insights for an organization."""
-        query = self._client.table("insights") \
-            .select("*, recommended_actions(*)") \
+        result = await self._insights_query(
+            org_id, is_read, insight_type, severity, is_dismissed
+        ) \
+            .order("created_at", desc=True) \
+            .limit(limit) \
+            .execute()
+        return result.data
+
+    async def get_insights_with_total(
+        self,
+        org_id: str,
+        is_read: Optional[bool] = None,
+        limit: int = 20,
+        insight_type: Optional[str] = None,
+        severity: Optional[str] = None,
+        is_dismissed: bool = False,
+    ) -> tuple[list[dict], int]:
+        """
+        Get a page of insights plus the total matching the same filters.
+
+        The exact count comes back with the page (Content-Range), so this
+        is still a single round-trip.
+        """
+        result = await self._insights_query(
+            org_id, is_read, insight_type, severity, is_dismissed, count="exact"
+        ) \
+            .order("created_at", desc=True) \
+            .limit(limit) \
+            .execute()
+        data = result.data or []
+        return data, result.count if result.count is not None else len(data)
+
+    def _insights_query(
+        self,
+        org_id: str,
+        is_read: Optional[bool],
+        insight_type: Optional[str],
+        severity: Optional[str],
+        is_dismissed: bool,
+        count: Optional[str] = None,
+    ):
+        """Build the filtered insights select shared by the list methods."""
+        query = self.db.table("insights") \
+            .select(INSIGHT_WITH_ACTIONS_SELECT, count=count) \
             .eq("org_id", org_id) \
-            .eq("is_dismissed", False)
+            .eq("is_dismissed", is_dismissed)
 
         if is_read is not None:
             query = query.eq("is_read", is_read)
 
-        result = query \
+        if insight_type:
+            query = query.eq("insight_type", insight_type)
+
+        if severity:
+            query = query.eq("severity", severity)
+
+        return query
+
+    async def get_insight_with_actions(self, insight_id: str, org_id: str) -> Optional[dict]:
+        """Get an org's insight with its recommended_actions embedded. Returns None if not found."""
+        result = await self.db.table("insights") \
+            .select(INSIGHT_WITH_ACTIONS_SELECT) \
+            .eq("id", insight_id) \
+            .eq("org_id", org_id) \
+            .limit(1) \
+            .execute()
+        return result.data[0] if result.data else None
+
+    async def count_unread_insights(self, org_id: str) -> int:
+        """Count unread, non-dismissed insights (HEAD request, no rows returned)."""
+        result = await self.db.table("insights") \
+            .select("id", count="exact", head=True) \
+            .eq("org_id", org_id) \
+            .eq("is_read", False) \
+            .eq("is_dismissed", False) \
+            .execute()
+        return result.count or 0
+
+    async def mark_insight_read(self, insight_id: str, org_id: str) -> list[dict]:
+        """Mark an org's insight as read. Returns the updated rows (empty if no match)."""
+        return await self.mark_insights_read([insight_id], org_id)
+
+    async def mark_insights_read(self, insight_ids: list[str], org_id: str) -> list[dict]:
+        """Mark several of an org's insights as read in one UPDATE."""
+        result = await self.db.table("insights") \
+            .update({"is_read": True, "read_at": "now()"}) \
+            .in_("id", insight_ids) \
+            .eq("org_id", org_id) \
+            .execute()
+        return result.data or []
+
+    async def dismiss_insights(self, insight_ids: list[str], org_id: str) -> list[dict]:
+        """Dismiss several of an org's insights in one UPDATE."""
+        result = await self.db.table("insights") \
+            .update({"is_dismissed": True}) \
+            .in_("id", insight_ids) \
+            .eq("org_id", org_id) \
+            .execute()
+        return result.data or []
+
+    async def dismiss_actions(self, action_ids: list[str], org_id: str) -> list[dict]:
+        """Dismiss several of an org's recommended actions in one UPDATE."""
+        result = await self.db.table("recommended_actions") \
+            .update({"status": "dismissed"}) \
+            .in_("id", action_ids) \
+            .eq("org_id", org_id) \
+            .execute()
+        return result.data or []
+
+    async def get_actions_with_total(
+        self,
+        org_id: str,
+        status: Optional[str] = None,
+        limit: int = 20,
+    ) -> tuple[list[dict], int]:
+        """Get a page of an org's recommended actions plus the exact total for the filter."""
+        query = self.db.table("recommended_actions") \
+            .select("*", count="exact") \
+            .eq("org_id", org_id)
+
+        if status:
+            query = query.eq("status", status)
+
+        result = await query \
             .order("created_at", desc=True) \
             .limit(limit) \
             .execute()
-        return result.data
+        data = result.data or []
+        return data, result.count if result.count is not None else len(data)
+
+    async def approve_action(self, action_id: str, org_id: str, user_id: str) -> list[dict]:
+        """
+        Move an org's pending action to approved.
+
+        The status guard makes the transition atomic; returns the updated
+        rows (empty if the action is missing, foreign or not pending).
+        """
+        result = await self.db.table("recommended_actions") \
+            .update({
+                "status": "approved",
+                "executed_at": "now()",
+                "executed_by": user_id,
+            }) \
+            .eq("id", action_id) \
+            .eq("org_id", org_id) \
+            .eq("status", "pending") \
+            .execute()
+        return result.data or []
 
-    async def mark_insight_read(self, insight_id: str) -> None:
-        """Mark an insight as read."""
-        self._client.table("insights") \
-            .update({"is_read": True, "read_at": "now()"}) \
-            .eq("id", insight_id) \
+    async def get_row(self, table: str, row_id: str) -> Optional[dict]:
+        """Get a row by ID without org scoping. Returns None if not found."""
+        result = await self.db.table(table) \
+            .select("*") \
+            .eq("id", row_id) \
+            .limit(1) \
+            .execute()
+        return result.data[0] if result.data else None
+
+    # ===========================================
+    # DAILY DIGEST OPERATIONS
+    # ===========================================
+
+    async def get_daily_digest(self, org_id: str, digest_date: str) -> Optional[dict]:
+        """Get an org's digest for one date. Returns None if not generated yet."""
+        result = await self.db.table("daily_digests") \
+            .select("*") \
+            .eq("org_id", org_id) \
+            .eq("digest_date", digest_date) \
+            .limit(1) \
+            .execute()
+        return result.data[0] if result.data else None
+
+    async def get_daily_digests_with_total(
+        self,
+        org_id: str,
+        limit: int = 7,
+    ) -> tuple[list[dict], int]:
+        """Get an org's most recent digests plus the exact total."""
+        result = await self.db.table("daily_digests") \
+            .select("*", count="exact") \
+            .eq("org_id", org_id) \
+            .order("digest_date", desc=True) \
+            .limit(limit) \
             .execute()
+        data = result.data or []
+        return data, result.count if result.count is not None else len(data)
 
     # ===========================================
     # SYNC JOBS OPERATIONS
@@ -282,14 +721,14 @@ class SupabaseService:
 
     async def create_sync_job(self, data: dict) -> dict:
         """Create a new sync job."""
-        result = self._client.table("sync_jobs") \
+        result = await self.db.table("sync_jobs") \
             .insert(data) \
             .execute()
         return result.data[0]
 
     async def update_sync_job(self, job_id: str, data: dict) -> dict:
         """Update sync job status."""
-        result = self._client.table("sync_jobs") \
+        result = await self.db.table("sync_jobs") \
             .update(data) \
             .eq("id", job_id) \
             .execute()
@@ -297,7 +736,7 @@ class SupabaseService:
 
     async def get_latest_sync_job(self, account_id: str) -> Optional[dict]:
         """Get the latest sync job for an account."""
-        result = self._client.table("sync_jobs") \
+        result = await self.db.table("sync_jobs") \
             .select("*") \
             .eq("account_id", account_id) \
             .order("created_at", desc=True) \
@@ -311,7 +750,7 @@ class SupabaseService:
 
     async def get_active_campaigns_for_org(self, org_id: str) -> list[dict]:
         """Get all active campaigns with their account info for an org."""
-        result = self._client.table("campaigns") \
+        result = await self.db.table("campaigns") \
             .select("*, connected_accounts!inner(id, platform, account_name, org_id)") \
             .eq("connected_accounts.org_id", org_id) \
             .eq("connected_accounts.is_active", True) \
@@ -326,7 +765,7 @@ class SupabaseService:
         date_to: str,
     ) -> list[dict]:
         """Get daily metrics at campaign level for an org."""
-        result = self._client.table("daily_metrics") \
+        result = await self.db.table("daily_metrics") \
             .select("*, connected_accounts!inner(org_id, platform, account_name, is_active)") \
             .eq("connected_accounts.org_id", org_id) \
             .eq("connected_accounts.is_active", True) \
@@ -343,14 +782,14 @@ class SupabaseService:
 
     async def create_chat_thread(self, data: dict) -> dict:
         """Create a new chat thread."""
-        result = self._client.table("chat_threads") \
+        result = await self.db.table("chat_threads") \
             .insert(data) \
             .execute()
         return result.data[0]
 
     async def get_chat_thread(self, thread_id: str) -> Optional[dict]:
         """Get a chat thread by ID."""
-        result = self._client.table("chat_threads") \
+        result = await self.db.table("chat_threads") \
             .select("*") \
             .eq("id", thread_id) \
             .limit(1) \
@@ -364,7 +803,7 @@ class SupabaseService:
         limit: int = 50,
     ) -> list[dict]:
         """Get chat threads for a user in an organization."""
-        result = self._client.table("chat_threads") \
+        result = await self.db.table("chat_threads") \
             .select("*") \
             .eq("org_id", org_id) \
             .eq("user_id", user_id) \
@@ -376,7 +815,7 @@ class SupabaseService:
 
     async def update_chat_thread(self, thread_id: str, data: dict) -> dict:
         """Update a chat thread."""
-        result = self._client.table("chat_threads") \
+        result = await self.db.table("chat_threads") \
             .update(data) \
             .eq("id", thread_id) \
             .execute()
@@ -384,7 +823,7 @@ class SupabaseService:
 
     async def create_chat_message(self, data: dict) -> dict:
         """Create a new chat message."""
-        result = self._client.table("chat_messages") \
+        result = await self.db.table("chat_messages") \
             .insert(data) \
             .execute()
         return result.data[0]
@@ -395,7 +834,7 @@ class SupabaseService:
         limit: int = 100,
     ) -> list[dict]:
         """Get messages for a chat thread."""
-        result = self._client.table("chat_messages") \
+        result = await self.db.table("chat_messages") \
             .select("*") \
             .eq("thread_id", thread_id) \
             .order("created_at", desc=False) \
@@ -405,7 +844,7 @@ class SupabaseService:
 
     async def get_latest_insight_time(self, org_id: str) -> Optional[str]:
         """Get the created_at of the most recent insight for rate limiting."""
-        result = self._client.table("insights") \
+        result = await self.db.table("insights") \
             .select("created_at") \
             .eq("org_id", org_id) \
             .order("created_at", desc=True) \
@@ -414,7 +853,18 @@ class SupabaseService:
         return result.data[0]["created_at"] if result.data else None
 
 
+_shared_service: Optional[SupabaseService] = None
+
+
 # Convenience function for dependency injection
 def get_supabase_service() -> SupabaseService:
-    """Get SupabaseService instance for dependency injection."""
-    return SupabaseService()
+    """
+    Get the shared SupabaseService instance for dependency injection.
+
+    The service holds no per-request state (only the shared client), so
+    one instance serves every request and task.
+    """
+    global _shared_service
+    if _shared_service is None:
+        _shared_service = SupabaseService()
+    return _shared_service
@@ -8,12 +8,13 @@ import logging
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
-from fastapi import FastAPI, Request, status
+import orjson
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from fastapi.openapi.utils import get_openapi
 
 from app.core.config import settings
+from app.core.supabase import close_rest_client
 from app.api.v1 import router as v1_router
 from app.models.common import ErrorResponse, ErrorDetail, HealthResponse
 
@@ -37,6 +38,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down...")
+    from app.connectors.google_ads import shutdown_ads_pool
+    shutdown_ads_pool()
+    await close_rest_client()
 
 
 # Create FastAPI app
@@ -65,6 +69,8 @@ app = FastAPI(
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
     lifespan=lifespan,
+    # No default_response_class: routes with a response_model are serialized
+    # straight to JSON bytes by Pydantic, which a custom class would disable
 )
 
 
@@ -94,11 +100,25 @@ def custom_openapi():
     openapi_schema["security"] = [{"BearerAuth": []}]
     
     app.openapi_schema = openapi_schema
+    app.state.openapi_bytes = orjson.dumps(openapi_schema)
     return app.openapi_schema
 
 
 app.openapi = custom_openapi
 
+# FastAPI's own /openapi.json route re-serializes the schema dict on every
+# request; swap it for one that serves the bytes cached by custom_openapi
+app.router.routes[:] = [
+    route for route in app.router.routes
+    if getattr(route, "path", None) != app.openapi_url
+]
+
+
+@app.get(app.openapi_url, include_in_schema=False)
+async def openapi_json():
+    app.openapi()
+    return Response(app.state.openapi_bytes, media_type="application/json")
+
 
 # CORS Middleware - Convert AnyHttpUrl to strings and strip trailing slashes
 cors_origins = [str(origin).rstrip("/") for origin in settings.backend_cors_origins]
@@ -128,7 +148,8 @@ async def global_exception_handler(request: Request, exc: Exception):
     """Handle uncaught exceptions."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
     
-    return JSONResponse(
+    # model_dump_json serializes straight to JSON, no intermediate dict
+    return Response(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=ErrorResponse(
             error=ErrorDetail(
@@ -136,7 +157,8 @@ async def global_exception_handler(request: Request, exc: Exception):
                 message="Bir hata oluştu. Lütfen daha sonra tekrar deneyin.",
                 details={"error": str(exc)} if settings.debug else None,
             )
-        ).model_dump(),
+        ).model_dump_json(),
+        media_type="application/json",
     )
 
 
@@ -152,23 +174,29 @@ async def health_check():
     
     Returns the application status and version.
     """
-    return HealthResponse(
+    health = HealthResponse(
         status="healthy",
         version=settings.app_version,
         timestamp=datetime.now(timezone.utc).isoformat(),
     )
+    return Response(health.model_dump_json(), media_type="application/json")
+
+
+# Root and readiness bodies never change - serialized once at import
+_ROOT_BODY = orjson.dumps({
+    "name": settings.app_name,
+    "version": settings.app_version,
+    "docs": "/docs" if settings.debug else "Disabled in production",
+    "health": "/health",
+})
+_READY_BODY = orjson.dumps({"ready": True})
 
 
 # Root endpoint
 @app.get("/", tags=["System"])
 async def root():
     """Root endpoint with API info."""
-    return {
-        "name": settings.app_name,
-        "version": settings.app_version,
-        "docs": "/docs" if settings.debug else "Disabled in production",
-        "health": "/health",
-    }
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
 # Ready endpoint (for Kubernetes/Railway probes)
@@ -176,4 +204,4 @@ async def root():
 async def ready():
     """Readiness probe endpoint."""
     # TODO: Check database connection, Redis, etc.
-    return {"ready": True}
+    return Response(_READY_BODY, media_type="application/json")
@@ -32,6 +32,7 @@ from app.models.metrics import (
     CampaignMetricsList,
     PlatformMetrics,
     MetricsByPlatform,
+    MetricsDashboard,
 )
 from app.models.insight import (
     InsightType,
@@ -41,6 +42,8 @@ from app.models.insight import (
     InsightList,
     InsightReadRequest,
     InsightDismissRequest,
+    BulkIdsRequest,
+    BulkUpdateResponse,
     ActionResponse,
     ActionList,
     ActionExecuteRequest,
@@ -95,6 +98,7 @@ __all__ = [
     "CampaignMetricsList",
     "PlatformMetrics",
     "MetricsByPlatform",
+    "MetricsDashboard",
     # Insights
     "InsightType",
     "InsightSeverity",
@@ -103,6 +107,8 @@ __all__ = [
     "InsightList",
     "InsightReadRequest",
     "InsightDismissRequest",
+    "BulkIdsRequest",
+    "BulkUpdateResponse",
     "ActionResponse",
     "ActionList",
     "ActionExecuteRequest",
@@ -42,9 +42,14 @@ class PaginationMeta(BaseModel):
 
     @classmethod
     def calculate(cls, page: int, per_page: int, total: int) -> "PaginationMeta":
-        """Calculate pagination metadata."""
-        total_pages = (total + per_page - 1) // per_page if per_page > 0 else 0
-        return cls(
+        """
+        Calculate pagination metadata.
+
+        Built with model_construct: the inputs come from validated query
+        params and row counts, so the Field bounds are not re-checked.
+        """
+        total_pages = -(-total // per_page) if per_page > 0 else 0
+        return cls.model_construct(
             page=page,
             per_page=per_page,
             total=total,
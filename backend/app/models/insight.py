@@ -10,7 +10,7 @@ from decimal import Decimal
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 from app.models.account import Platform
 
@@ -158,6 +158,16 @@ class InsightDismissRequest(BaseModel):
     reason: Optional[str] = None
 
 
+class BulkIdsRequest(BaseModel):
+    """Request to apply one update to several insights or actions."""
+    ids: list[str] = Field(..., min_length=1, max_length=100)
+
+
+class BulkUpdateResponse(BaseModel):
+    """Number of rows a bulk update changed."""
+    updated_count: int
+
+
 # ===========================================
 # DAILY DIGEST MODELS
 # ===========================================
@@ -201,3 +211,14 @@ class DigestList(BaseModel):
     """List of digests."""
     digests: list[DailyDigestResponse]
     total: int
+
+
+# ===========================================
+# LIST ADAPTERS
+# ===========================================
+
+# Validate a whole result set in one pydantic-core call instead of one
+# model init per row
+ACTION_LIST_ADAPTER = TypeAdapter(list[ActionResponse])
+INSIGHT_LIST_ADAPTER = TypeAdapter(list[InsightResponse])
+DIGEST_LIST_ADAPTER = TypeAdapter(list[DailyDigestResponse])
@@ -9,7 +9,7 @@ from decimal import Decimal
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, Field, computed_field
+from pydantic import BaseModel, ConfigDict, Field, computed_field
 
 from app.models.account import Platform
 
@@ -42,7 +42,15 @@ class DateRange(BaseModel):
 # ===========================================
 
 class BaseMetrics(BaseModel):
-    """Base metrics that all levels share."""
+    """
+    Base metrics that all levels share.
+
+    Amounts are Decimal; the derived ratios are reporting values and are
+    computed as floats.
+    """
+    # Instances are shared across requests by the metrics response cache
+    model_config = ConfigDict(frozen=True)
+
     impressions: int = 0
     clicks: int = 0
     spend: Decimal = Decimal("0.00")  # Converted from micros
@@ -52,43 +60,43 @@ class BaseMetrics(BaseModel):
 
     @computed_field
     @property
-    def ctr(self) -> Optional[Decimal]:
+    def ctr(self) -> Optional[float]:
         """Click-through rate."""
         if self.impressions == 0:
             return None
-        return Decimal(self.clicks) / Decimal(self.impressions) * 100
+        return self.clicks / self.impressions * 100.0
 
     @computed_field
     @property
-    def cpc(self) -> Optional[Decimal]:
+    def cpc(self) -> Optional[float]:
         """Cost per click."""
         if self.clicks == 0:
             return None
-        return self.spend / Decimal(self.clicks)
+        return float(self.spend) / self.clicks
 
     @computed_field
     @property
-    def cpm(self) -> Optional[Decimal]:
+    def cpm(self) -> Optional[float]:
         """Cost per mille (1000 impressions)."""
         if self.impressions == 0:
             return None
-        return self.spend / Decimal(self.impressions) * 1000
+        return float(self.spend) / self.impressions * 1000.0
 
     @computed_field
     @property
-    def roas(self) -> Optional[Decimal]:
+    def roas(self) -> Optional[float]:
         """Return on ad spend."""
         if self.spend == 0:
             return None
-        return self.conversion_value / self.spend
+        return float(self.conversion_value) / float(self.spend)
 
     @computed_field
     @property
-    def cpa(self) -> Optional[Decimal]:
+    def cpa(self) -> Optional[float]:
         """Cost per acquisition."""
         if self.conversions == 0:
             return None
-        return self.spend / self.conversions
+        return float(self.spend) / float(self.conversions)
 
 
 class DailyMetrics(BaseMetrics):
@@ -103,8 +111,7 @@ class DailyMetrics(BaseMetrics):
     # Extra platform-specific metrics
     extra_metrics: dict = Field(default_factory=dict)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 # ===========================================
@@ -150,11 +157,11 @@ class MetricsSummary(BaseModel):
     currency: str = "TRY"
     
     # Calculated metrics
-    ctr: Optional[Decimal] = None
-    cpc: Optional[Decimal] = None
-    cpm: Optional[Decimal] = None  
-    roas: Optional[Decimal] = None
-    cpa: Optional[Decimal] = None
+    ctr: Optional[float] = None
+    cpc: Optional[float] = None
+    cpm: Optional[float] = None
+    roas: Optional[float] = None
+    cpa: Optional[float] = None
     
     # Changes (if comparison period provided)
     impressions_change: Optional[MetricChange] = None
@@ -170,6 +177,8 @@ class MetricsSummary(BaseModel):
 
 class MetricsByDate(BaseModel):
     """Metrics grouped by date for charts."""
+    model_config = ConfigDict(frozen=True)
+
     date: date
     impressions: int = 0
     clicks: int = 0
@@ -209,8 +218,7 @@ class CampaignMetrics(BaseMetrics):
     spend_change_percent: Optional[Decimal] = None
     roas_change_percent: Optional[Decimal] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class CampaignMetricsList(BaseModel):
@@ -238,3 +246,16 @@ class MetricsByPlatform(BaseModel):
     date_to: date
     platforms: list[PlatformMetrics]
     total: MetricsSummary
+
+
+# ===========================================
+# DASHBOARD
+# ===========================================
+
+class MetricsDashboard(BaseModel):
+    """Summary, daily trend and platform breakdown for one date range."""
+    date_from: date
+    date_to: date
+    summary: MetricsSummary
+    daily: list[MetricsByDate]
+    platforms: list[PlatformMetrics]
@@ -11,6 +11,7 @@ import logging
 from datetime import date, timedelta
 from typing import AsyncGenerator, Optional
 
+import orjson
 from openai import AsyncOpenAI
 
 from app.core.config import settings
@@ -320,6 +321,20 @@ TOOL_DEFINITIONS = [
     },
 ]
 
+# System message for the DB-context fallback; only the data is appended per call
+DB_CONTEXT_SYSTEM_PROMPT = (
+    SYSTEM_PROMPT + "\n\nAşağıda kullanıcının veritabanından çekilen güncel verileri var. "
+    "Bu verileri kullanarak soruyu mümkün olduğunca detaylı cevapla. "
+    "Eğer sorunun cevabı veriler arasında yoksa, hangi verilerin mevcut olduğunu ve "
+    "sorunun nasıl cevaplanabileceğini açıkla.\n\n"
+    "VERİTABANI VERİLERİ:\n"
+)
+
+# Assistant whose instructions and tools were pushed by this process.
+# ChatService is built per request, so the sync state lives at module level
+# and SYSTEM_PROMPT / TOOL_DEFINITIONS are sent to OpenAI once per process.
+_synced_assistant_id: Optional[str] = None
+
 
 class ChatService:
     """
@@ -335,20 +350,24 @@ class ChatService:
         self.assistant_id = settings.openai_assistant_id
 
     async def ensure_assistant(self) -> str:
-        """Get or create the OpenAI Assistant with tools. Updates existing assistant's config."""
+        """Get or create the OpenAI Assistant with tools. Updates existing assistant's config once per process."""
+        global _synced_assistant_id
+        if _synced_assistant_id:
+            self.assistant_id = _synced_assistant_id
+            return _synced_assistant_id
+
         if self.assistant_id:
             # Update existing assistant with latest instructions and tools
-            if not getattr(self, '_assistant_updated', False):
-                try:
-                    await self.openai_client.beta.assistants.update(
-                        assistant_id=self.assistant_id,
-                        instructions=SYSTEM_PROMPT,
-                        tools=TOOL_DEFINITIONS,
-                    )
-                    self._assistant_updated = True
-                    logger.info(f"Updated OpenAI Assistant: {self.assistant_id}")
-                except Exception as e:
-                    logger.warning(f"Failed to update assistant, using existing: {e}")
+            try:
+                await self.openai_client.beta.assistants.update(
+                    assistant_id=self.assistant_id,
+                    instructions=SYSTEM_PROMPT,
+                    tools=TOOL_DEFINITIONS,
+                )
+                _synced_assistant_id = self.assistant_id
+                logger.info(f"Updated OpenAI Assistant: {self.assistant_id}")
+            except Exception as e:
+                logger.warning(f"Failed to update assistant, using existing: {e}")
             return self.assistant_id
 
         # Create assistant on-the-fly
@@ -360,7 +379,7 @@ class ChatService:
         )
 
         self.assistant_id = assistant.id
-        self._assistant_updated = True
+        _synced_assistant_id = assistant.id
         logger.info(f"Created OpenAI Assistant: {assistant.id}")
 
         # Optionally save to settings for reuse
@@ -507,10 +526,9 @@ class ChatService:
 
             # Fetch campaigns with per-campaign metrics
             if accounts:
-                all_campaigns = []
-                for acc in accounts[:5]:  # Limit to first 5 accounts
-                    campaigns = await self.supabase.get_campaigns(acc["id"])
-                    all_campaigns.extend(campaigns)
+                all_campaigns = await self.supabase.get_campaigns_for_accounts(
+                    [acc["id"] for acc in accounts[:5]]  # Limit to first 5 accounts
+                )
 
                 if all_campaigns:
                     active = [c for c in all_campaigns if c.get("status") == "enabled"]
@@ -570,11 +588,7 @@ class ChatService:
                 messages=[
                     {
                         "role": "system",
-                        "content": SYSTEM_PROMPT + "\n\nAşağıda kullanıcının veritabanından çekilen güncel verileri var. "
-                        "Bu verileri kullanarak soruyu mümkün olduğunca detaylı cevapla. "
-                        "Eğer sorunun cevabı veriler arasında yoksa, hangi verilerin mevcut olduğunu ve "
-                        "sorunun nasıl cevaplanabileceğini açıkla.\n\n"
-                        "VERİTABANI VERİLERİ:\n" + db_context,
+                        "content": DB_CONTEXT_SYSTEM_PROMPT + db_context,
                     },
                     {"role": "user", "content": message},
                 ],
@@ -716,7 +730,7 @@ class ChatService:
                                 if block.type == "text" and block.text:
                                     text = block.text.value
                                     full_response += text
-                                    yield self._sse_event("text_delta", content=text)
+                                    yield self._sse_text_delta(text)
 
                     elif event.event == "thread.run.requires_action":
                         run = event.data
@@ -798,7 +812,7 @@ class ChatService:
                                                 if block.type == "text" and block.text:
                                                     text = block.text.value
                                                     full_response += text
-                                                    yield self._sse_event("text_delta", content=text)
+                                                    yield self._sse_text_delta(text)
 
                     elif event.event == "thread.run.completed":
                         pass  # Run completed successfully
@@ -824,7 +838,7 @@ class ChatService:
                 # Stream the fallback response
                 for i in range(0, len(fallback_text), 20):
                     chunk = fallback_text[i:i + 20]
-                    yield self._sse_event("text_delta", content=chunk)
+                    yield self._sse_text_delta(chunk)
 
         # Save assistant message to DB
         if full_response:
@@ -1087,7 +1101,7 @@ class ChatService:
                 for i, row in enumerate(response):
                     if i >= 50:  # Limit to 50 rows
                         break
-                    row_dict = json_format.MessageToDict(row._pb)
+                    row_dict = json_format.MessageToDict(row)
                     rows.append(row_dict)
 
                 return json.dumps({
@@ -1138,6 +1152,11 @@ class ChatService:
         except Exception as e:
             logger.warning(f"Auto-title failed: {e}")
 
+    @staticmethod
+    def _sse_text_delta(content: str) -> str:
+        """Format a text_delta SSE event - the per-token case - without building a dict."""
+        return f'data: {{"type":"text_delta","content":{orjson.dumps(content).decode()}}}\n\n'
+
     @staticmethod
     def _sse_event(
         event_type: str,
@@ -1160,4 +1179,4 @@ class ChatService:
         if message_id is not None:
             data["message_id"] = message_id
 
-        return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+        return f"data: {orjson.dumps(data).decode()}\n\n"
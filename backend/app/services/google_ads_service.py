@@ -197,6 +197,7 @@ async def sync_account_metrics(account_id: str, date_from: str, date_to: str) ->
             date_to=end_date,
             level="campaign",
             account_id=customer_id,
+            derived=False,  # generated columns in daily_metrics
         )
 
         logger.info(f"Fetched {len(metrics)} metric records from Google Ads API")
@@ -4,10 +4,14 @@ Ad Platform MVP - Celery Application
 Celery configuration and app initialization.
 """
 
+import asyncio
+from typing import Any, Coroutine
+
 from celery import Celery
 from celery.schedules import crontab
 
 from app.core.config import settings
+from app.core.supabase import close_rest_client
 
 
 # Create Celery app
@@ -69,3 +73,20 @@ celery_app.conf.update(
         },
     },
 )
+
+
+def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a task's async body under a fresh event loop.
+
+    The async PostgREST client is bound to the loop that created it, so it
+    is closed before asyncio.run() tears the loop down instead of leaking
+    its connection pool with every task.
+    """
+    async def _run() -> Any:
+        try:
+            return await coro
+        finally:
+            await close_rest_client()
+
+    return asyncio.run(_run())
@@ -11,7 +11,7 @@ from datetime import date, timedelta
 from decimal import Decimal
 from typing import Optional
 
-from app.tasks import celery_app
+from app.tasks import celery_app, run_async
 from app.core.config import settings
 from app.core.supabase import get_supabase_service
 
@@ -74,8 +74,7 @@ def generate_daily_insights():
 
     Scheduled to run daily at 7 AM.
     """
-    import asyncio
-    asyncio.run(_generate_daily_insights_async())
+    run_async(_generate_daily_insights_async())
 
 
 async def _generate_daily_insights_async():
@@ -167,23 +166,35 @@ async def generate_org_insights(org_id: str) -> list[dict]:
                 created_insights.append(insight)
 
                 # Save recommended actions with CORRECT column names
-                for action_data in insight_data.get("actions", []):
+                actions = [
+                    {
+                        "insight_id": insight["id"],
+                        "org_id": org_id,
+                        "action_type": action_data.get("action_type", "review_creative"),
+                        "platform": action_data.get("platform", insight_data.get("platform", "google_ads")),
+                        "title": action_data.get("title", ""),
+                        "description": action_data.get("description", "Detay yok"),
+                        "rationale": action_data.get("rationale"),
+                        "expected_impact": action_data.get("expected_impact"),
+                        "is_executable": False,
+                        "priority": 50,
+                        "status": "pending",
+                    }
+                    for action_data in insight_data.get("actions", [])
+                ]
+
+                if actions:
+                    # One insert per insight; fall back to row-by-row so one
+                    # bad action doesn't drop the rest
                     try:
-                        supabase.client.table("recommended_actions").insert({
-                            "insight_id": insight["id"],
-                            "org_id": org_id,
-                            "action_type": action_data.get("action_type", "review_creative"),
-                            "platform": action_data.get("platform", insight_data.get("platform", "google_ads")),
-                            "title": action_data.get("title", ""),
-                            "description": action_data.get("description", "Detay yok"),
-                            "rationale": action_data.get("rationale"),
-                            "expected_impact": action_data.get("expected_impact"),
-                            "is_executable": False,
-                            "priority": 50,
-                            "status": "pending",
-                        }).execute()
-                    except Exception as ae:
-                        logger.error(f"Failed to save action for insight {insight['id']}: {ae}")
+                        supabase.client.table("recommended_actions").insert(actions).execute()
+                    except Exception as be:
+                        logger.warning(f"Batch action insert failed for insight {insight['id']}, retrying per row: {be}")
+                        for action in actions:
+                            try:
+                                supabase.client.table("recommended_actions").insert(action).execute()
+                            except Exception as ae:
+                                logger.error(f"Failed to save action for insight {insight['id']}: {ae}")
 
             except Exception as ie:
                 logger.error(f"Failed to save insight: {ie}")
@@ -203,8 +214,7 @@ def send_daily_digests():
 
     Scheduled to run daily at 9 AM.
     """
-    import asyncio
-    asyncio.run(_send_daily_digests_async())
+    run_async(_send_daily_digests_async())
 
 
 async def _send_daily_digests_async():
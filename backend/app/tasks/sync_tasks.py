@@ -8,7 +8,8 @@ import logging
 from datetime import date, timedelta
 from typing import Optional
 
-from app.tasks import celery_app
+from app.cache import bump_org_metrics_version
+from app.tasks import celery_app, run_async
 from app.core.supabase import get_supabase_service
 from app.core.security import decrypt_token
 
@@ -35,8 +36,7 @@ def sync_account_metrics(
         date_from: Start date (YYYY-MM-DD), defaults to yesterday
         date_to: End date (YYYY-MM-DD), defaults to yesterday
     """
-    import asyncio
-    asyncio.run(_sync_account_metrics_async(self, job_id, date_from, date_to))
+    run_async(_sync_account_metrics_async(self, job_id, date_from, date_to))
 
 
 async def _sync_account_metrics_async(
@@ -117,11 +117,14 @@ async def _sync_account_metrics_async(
                 date_from=sync_date_from,
                 date_to=sync_date_to,
                 level="campaign",
+                derived=False,  # generated columns in daily_metrics
             )
             
             if metrics:
                 records_synced = await _save_metrics(supabase, account["id"], metrics)
                 logger.info(f"Saved {records_synced} metric records for account {account['id']}")
+                # Retire the API processes' cached metrics for this org
+                bump_org_metrics_version(account["org_id"])
             else:
                 logger.warning(f"No metrics returned for account {account['id']}")
             
@@ -168,8 +171,7 @@ def sync_all_accounts():
     
     Scheduled to run daily at 6 AM.
     """
-    import asyncio
-    asyncio.run(_sync_all_accounts_async())
+    run_async(_sync_all_accounts_async())
 
 
 async def _sync_all_accounts_async():
@@ -0,0 +1,13 @@
+"""
+Ad Platform MVP - Test Configuration
+
+Placeholder values for the settings that have no default, so app modules
+can be imported without a .env file.
+"""
+
+import os
+
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-service-role-key")
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret")
+os.environ.setdefault("ENCRYPTION_KEY", "00" * 32)
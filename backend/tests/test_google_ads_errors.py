@@ -0,0 +1,75 @@
+"""
+Ad Platform MVP - Google Ads Error Handling Tests
+
+GoogleAdsException.failure is a proto-plus message; these build real
+failures to check the oneof and retry-delay handling against it.
+"""
+
+import importlib
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("google.ads.googleads")
+
+from google.ads.googleads.client import _DEFAULT_VERSION  # noqa: E402
+from google.ads.googleads.errors import GoogleAdsException  # noqa: E402
+
+from app.connectors import _ratelimit, google_ads  # noqa: E402
+from app.connectors.google_ads import GoogleAdsConnector  # noqa: E402
+
+_errors = importlib.import_module(f"google.ads.googleads.{_DEFAULT_VERSION}.errors.types.errors")
+
+
+def _exception(details=None, **error_code) -> GoogleAdsException:
+    """A GoogleAdsException carrying one error with the given error_code oneof."""
+    error = _errors.GoogleAdsError(
+        error_code=_errors.ErrorCode(**error_code),
+        message="test",
+        details=details,
+    )
+    failure = _errors.GoogleAdsFailure(errors=[error])
+    return GoogleAdsException(None, None, failure, "request-id")
+
+
+def _connector() -> GoogleAdsConnector:
+    return GoogleAdsConnector(
+        access_token="access",
+        refresh_token="refresh",
+        customer_id="123-456-7890",
+    )
+
+
+def test_error_code_kind_reads_proto_plus_oneof():
+    ex = _exception(authentication_error=2)
+    assert _ratelimit.error_code_kind(ex.failure.errors[0]) == "authentication_error"
+
+
+def test_auth_error_evicts_cached_validation():
+    connector = _connector()
+    key = (connector.customer_id, connector._token_digest)
+    google_ads._validated_cache.set(key, True)
+
+    connector._on_api_error(_exception(authentication_error=2))
+
+    assert google_ads._validated_cache.get(key) is google_ads.MISSING
+
+
+def test_non_auth_error_keeps_cached_validation():
+    connector = _connector()
+    key = (connector.customer_id, connector._token_digest)
+    google_ads._validated_cache.set(key, True)
+
+    connector._on_api_error(_exception(quota_error=2))
+
+    assert google_ads._validated_cache.get(key) is True
+
+
+def test_quota_error_is_retryable_with_server_delay():
+    details = _errors.ErrorDetails(
+        quota_error_details=_errors.QuotaErrorDetails(retry_delay=timedelta(seconds=5))
+    )
+    ex = _exception(details=details, quota_error=2)
+
+    assert _ratelimit._is_retryable(ex)
+    assert _ratelimit._retry_delay(ex) == 5.0
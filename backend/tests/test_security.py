@@ -0,0 +1,43 @@
+"""
+Ad Platform MVP - JWT Tests
+
+create_access_token signs HS* tokens itself; these check its output
+against PyJWT so the hand-built header, payload and signature stay valid.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import jwt
+import pytest
+
+from app.core.config import settings
+from app.core.security import create_access_token, decode_access_token
+
+
+def test_access_token_decodes_with_pyjwt():
+    issued = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    token = create_access_token({"sub": "user-1", "issued": issued, "quota": Decimal("1.50")})
+
+    payload = jwt.decode(
+        token,
+        settings.jwt_secret_key,
+        algorithms=[settings.jwt_algorithm],
+        options={"require": ["exp"]},
+    )
+
+    assert payload["sub"] == "user-1"
+    # orjson writes datetimes as ISO 8601; other values go through default=str
+    assert payload["issued"] == issued.isoformat()
+    assert payload["quota"] == "1.50"
+    assert jwt.get_unverified_header(token) == {"alg": settings.jwt_algorithm, "typ": "JWT"}
+
+
+def test_tampered_signature_is_rejected():
+    token = create_access_token({"sub": "user-1"})
+    signing_input, signature = token.rsplit(".", 1)
+    tampered = f"{signing_input}.{'A' if signature[0] != 'A' else 'B'}{signature[1:]}"
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        jwt.decode(tampered, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+    assert decode_access_token(tampered) is None
@@ -0,0 +1,11 @@
+-- Ad Platform MVP - Insights Filter Index
+-- Version: 1.0.2
+-- Date: 2026-10-15
+
+-- ============================================
+-- INSIGHTS LIST / UNREAD COUNT
+-- ============================================
+-- Backs list_insights filters (org_id, is_read, insight_type, severity)
+-- and the unread-count HEAD request.
+CREATE INDEX IF NOT EXISTS idx_insights_org_read_type_severity
+    ON insights(org_id, is_read, insight_type, severity);
@@ -0,0 +1,124 @@
+-- Ad Platform MVP - Campaign Metrics RPC
+-- Version: 1.0.3
+-- Date: 2026-10-15
+
+-- ============================================
+-- CAMPAIGN METRICS AGGREGATION
+-- ============================================
+-- Backs GET /metrics/campaigns: groups daily_metrics per campaign, sorts
+-- and paginates in Postgres so only one page crosses the wire.
+-- total_count carries the unpaginated row count via COUNT(*) OVER ().
+-- p_sort is matched against a fixed whitelist; unknown keys fall back to
+-- name order.
+CREATE OR REPLACE FUNCTION campaign_metrics_agg(
+    p_org UUID,
+    p_from DATE,
+    p_to DATE,
+    p_account UUID DEFAULT NULL,
+    p_platform TEXT DEFAULT NULL,
+    p_sort TEXT DEFAULT 'spend',
+    p_desc BOOLEAN DEFAULT TRUE,
+    p_limit INT DEFAULT 20,
+    p_offset INT DEFAULT 0
+)
+RETURNS TABLE (
+    id UUID,
+    account_id UUID,
+    platform TEXT,
+    platform_campaign_id VARCHAR,
+    name VARCHAR,
+    status VARCHAR,
+    campaign_type VARCHAR,
+    impressions BIGINT,
+    clicks BIGINT,
+    spend NUMERIC,
+    conversions NUMERIC,
+    conversion_value NUMERIC,
+    total_count BIGINT
+) AS $$
+    WITH agg AS (
+        SELECT
+            dm.campaign_id,
+            SUM(dm.impressions)::BIGINT AS impressions,
+            SUM(dm.clicks)::BIGINT AS clicks,
+            SUM(dm.spend) AS spend,
+            SUM(dm.conversions) AS conversions,
+            SUM(dm.conversion_value) AS conversion_value
+        FROM daily_metrics dm
+        JOIN connected_accounts ca ON ca.id = dm.account_id
+        WHERE ca.org_id = p_org
+          AND ca.is_active = TRUE
+          AND dm.date BETWEEN p_from AND p_to
+          AND dm.campaign_id IS NOT NULL
+          AND (p_account IS NULL OR dm.account_id = p_account)
+        GROUP BY dm.campaign_id
+    ),
+    campaign_rows AS (
+        SELECT
+            c.id,
+            c.account_id,
+            ca.platform::TEXT AS platform,
+            c.platform_campaign_id,
+            c.name,
+            c.status,
+            c.campaign_type,
+            COALESCE(a.impressions, 0) AS impressions,
+            COALESCE(a.clicks, 0) AS clicks,
+            COALESCE(a.spend, 0) AS spend,
+            COALESCE(a.conversions, 0) AS conversions,
+            COALESCE(a.conversion_value, 0) AS conversion_value
+        FROM campaigns c
+        JOIN connected_accounts ca ON ca.id = c.account_id
+        LEFT JOIN agg a ON a.campaign_id = c.id
+        WHERE ca.org_id = p_org
+          AND ca.is_active = TRUE
+          AND c.status <> 'removed'
+          AND (p_account IS NULL OR c.account_id = p_account)
+          AND (p_platform IS NULL OR ca.platform::TEXT = p_platform)
+    ),
+    keyed AS (
+        SELECT
+            r.*,
+            CASE p_sort
+                WHEN 'impressions' THEN r.impressions::NUMERIC
+                WHEN 'clicks' THEN r.clicks::NUMERIC
+                WHEN 'spend' THEN r.spend
+                WHEN 'conversions' THEN r.conversions
+                WHEN 'conversion_value' THEN r.conversion_value
+                WHEN 'ctr' THEN CASE WHEN r.impressions > 0
+                    THEN r.clicks::NUMERIC / r.impressions * 100 ELSE 0 END
+                WHEN 'cpc' THEN CASE WHEN r.clicks > 0
+                    THEN r.spend / r.clicks ELSE 0 END
+                WHEN 'cpm' THEN CASE WHEN r.impressions > 0
+                    THEN r.spend / r.impressions * 1000 ELSE 0 END
+                WHEN 'roas' THEN CASE WHEN r.spend > 0
+                    THEN r.conversion_value / r.spend ELSE 0 END
+                WHEN 'cpa' THEN CASE WHEN r.conversions > 0
+                    THEN r.spend / r.conversions ELSE 0 END
+                ELSE 0
+            END AS sort_value
+        FROM campaign_rows r
+    )
+    SELECT
+        k.id,
+        k.account_id,
+        k.platform,
+        k.platform_campaign_id,
+        k.name,
+        k.status,
+        k.campaign_type,
+        k.impressions,
+        k.clicks,
+        k.spend,
+        k.conversions,
+        k.conversion_value,
+        COUNT(*) OVER () AS total_count
+    FROM keyed k
+    ORDER BY
+        CASE WHEN p_sort = 'name' AND p_desc THEN k.name END DESC,
+        CASE WHEN p_sort = 'name' AND NOT p_desc THEN k.name END ASC,
+        CASE WHEN p_desc THEN k.sort_value END DESC,
+        CASE WHEN NOT p_desc THEN k.sort_value END ASC,
+        k.name
+    LIMIT p_limit OFFSET p_offset;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,113 @@
+-- Ad Platform MVP - Metrics Aggregate RPCs
+-- Version: 1.0.4
+-- Date: 2026-10-15
+
+-- ============================================
+-- METRICS SUMMARY
+-- ============================================
+-- Backs GET /metrics/summary: one row of totals plus distinct
+-- account / campaign counts for the org's active accounts.
+CREATE OR REPLACE FUNCTION metrics_summary(
+    p_org UUID,
+    p_from DATE,
+    p_to DATE,
+    p_account UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    impressions BIGINT,
+    clicks BIGINT,
+    spend NUMERIC,
+    conversions NUMERIC,
+    conversion_value NUMERIC,
+    accounts_count BIGINT,
+    campaigns_count BIGINT
+) AS $$
+    SELECT
+        COALESCE(SUM(dm.impressions), 0)::BIGINT,
+        COALESCE(SUM(dm.clicks), 0)::BIGINT,
+        COALESCE(SUM(dm.spend), 0),
+        COALESCE(SUM(dm.conversions), 0),
+        COALESCE(SUM(dm.conversion_value), 0),
+        COUNT(DISTINCT dm.account_id),
+        COUNT(DISTINCT dm.entity_id)
+    FROM daily_metrics dm
+    JOIN connected_accounts ca ON ca.id = dm.account_id
+    WHERE ca.org_id = p_org
+      AND ca.is_active = TRUE
+      AND dm.date BETWEEN p_from AND p_to
+      AND (p_account IS NULL OR dm.account_id = p_account);
+$$ LANGUAGE sql STABLE;
+
+-- ============================================
+-- METRICS BY DATE
+-- ============================================
+-- Backs GET /metrics/daily: one row per day, oldest first.
+CREATE OR REPLACE FUNCTION metrics_daily(
+    p_org UUID,
+    p_from DATE,
+    p_to DATE,
+    p_account UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    date DATE,
+    impressions BIGINT,
+    clicks BIGINT,
+    spend NUMERIC,
+    conversions NUMERIC,
+    conversion_value NUMERIC
+) AS $$
+    SELECT
+        dm.date,
+        COALESCE(SUM(dm.impressions), 0)::BIGINT,
+        COALESCE(SUM(dm.clicks), 0)::BIGINT,
+        COALESCE(SUM(dm.spend), 0),
+        COALESCE(SUM(dm.conversions), 0),
+        COALESCE(SUM(dm.conversion_value), 0)
+    FROM daily_metrics dm
+    JOIN connected_accounts ca ON ca.id = dm.account_id
+    WHERE ca.org_id = p_org
+      AND ca.is_active = TRUE
+      AND dm.date BETWEEN p_from AND p_to
+      AND (p_account IS NULL OR dm.account_id = p_account)
+    GROUP BY dm.date
+    ORDER BY dm.date;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================
+-- METRICS BY PLATFORM
+-- ============================================
+-- Backs GET /metrics/by-platform. Rows without a platform inherit the
+-- platform of their connected account.
+CREATE OR REPLACE FUNCTION metrics_by_platform(
+    p_org UUID,
+    p_from DATE,
+    p_to DATE,
+    p_account UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    platform TEXT,
+    impressions BIGINT,
+    clicks BIGINT,
+    spend NUMERIC,
+    conversions NUMERIC,
+    conversion_value NUMERIC,
+    accounts_count BIGINT,
+    campaigns_count BIGINT
+) AS $$
+    SELECT
+        COALESCE(dm.platform::TEXT, ca.platform::TEXT) AS platform,
+        COALESCE(SUM(dm.impressions), 0)::BIGINT,
+        COALESCE(SUM(dm.clicks), 0)::BIGINT,
+        COALESCE(SUM(dm.spend), 0),
+        COALESCE(SUM(dm.conversions), 0),
+        COALESCE(SUM(dm.conversion_value), 0),
+        COUNT(DISTINCT dm.account_id),
+        COUNT(DISTINCT dm.entity_id)
+    FROM daily_metrics dm
+    JOIN connected_accounts ca ON ca.id = dm.account_id
+    WHERE ca.org_id = p_org
+      AND ca.is_active = TRUE
+      AND dm.date BETWEEN p_from AND p_to
+      AND (p_account IS NULL OR dm.account_id = p_account)
+    GROUP BY 1;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,58 @@
+-- Ad Platform MVP - Metrics Daily Period Counts
+-- Version: 1.0.5
+-- Date: 2026-10-15
+
+-- ============================================
+-- METRICS BY DATE (WITH PERIOD COUNTS)
+-- ============================================
+-- Adds period-wide distinct account / campaign counts to every
+-- metrics_daily row so GET /metrics/daily can build its summary from the
+-- same result instead of a second metrics_summary round-trip.
+-- The return type changes, so the function is dropped first.
+DROP FUNCTION IF EXISTS metrics_daily(UUID, DATE, DATE, UUID);
+
+CREATE OR REPLACE FUNCTION metrics_daily(
+    p_org UUID,
+    p_from DATE,
+    p_to DATE,
+    p_account UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    date DATE,
+    impressions BIGINT,
+    clicks BIGINT,
+    spend NUMERIC,
+    conversions NUMERIC,
+    conversion_value NUMERIC,
+    accounts_count BIGINT,
+    campaigns_count BIGINT
+) AS $$
+    WITH base AS (
+        SELECT dm.*
+        FROM daily_metrics dm
+        JOIN connected_accounts ca ON ca.id = dm.account_id
+        WHERE ca.org_id = p_org
+          AND ca.is_active = TRUE
+          AND dm.date BETWEEN p_from AND p_to
+          AND (p_account IS NULL OR dm.account_id = p_account)
+    ),
+    period AS (
+        SELECT
+            COUNT(DISTINCT b.account_id) AS accounts_count,
+            COUNT(DISTINCT b.entity_id) AS campaigns_count
+        FROM base b
+    )
+    SELECT
+        b.date,
+        COALESCE(SUM(b.impressions), 0)::BIGINT,
+        COALESCE(SUM(b.clicks), 0)::BIGINT,
+        COALESCE(SUM(b.spend), 0),
+        COALESCE(SUM(b.conversions), 0),
+        COALESCE(SUM(b.conversion_value), 0),
+        p.accounts_count,
+        p.campaigns_count
+    FROM base b
+    CROSS JOIN period p
+    GROUP BY b.date, p.accounts_count, p.campaigns_count
+    ORDER BY b.date;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,40 @@
+-- Ad Platform MVP - Endpoint Filter Indexes
+-- Version: 1.0.6
+-- Date: 2026-10-15
+
+-- ============================================
+-- INSIGHTS LIST
+-- ============================================
+-- list_insights / generate_insights: org_id + is_dismissed equality,
+-- ORDER BY created_at DESC LIMIT n. Filtered variants use
+-- idx_insights_org_read_type_severity (004).
+CREATE INDEX IF NOT EXISTS idx_insights_org_dismissed_created
+    ON insights(org_id, is_dismissed, created_at DESC);
+
+-- ============================================
+-- RECOMMENDED ACTIONS LIST
+-- ============================================
+-- list_actions with and without the status filter.
+CREATE INDEX IF NOT EXISTS idx_actions_org_status_created
+    ON recommended_actions(org_id, status, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_actions_org_created
+    ON recommended_actions(org_id, created_at DESC);
+
+-- ============================================
+-- DAILY DIGESTS
+-- ============================================
+-- idx_digests_org_date (001, UNIQUE on org_id, digest_date) already
+-- serves both today's lookup and the history listing via a backward scan.
+
+-- ============================================
+-- DAILY METRICS
+-- ============================================
+-- daily_metrics has no org_id column; org scoping goes through
+-- connected_accounts, so the metrics RPCs probe by (account_id, date).
+-- INCLUDE lets the summary / daily / platform / campaign aggregations run
+-- as index-only scans.
+CREATE INDEX IF NOT EXISTS idx_daily_metrics_account_date_covering
+    ON daily_metrics(account_id, date)
+    INCLUDE (campaign_id, entity_id, platform, impressions, clicks,
+             spend, conversions, conversion_value);
@@ -0,0 +1,45 @@
+-- Ad Platform MVP - Metrics Summary Platform Filter
+-- Version: 1.0.7
+-- Date: 2026-10-15
+
+-- ============================================
+-- METRICS SUMMARY (WITH PLATFORM FILTER)
+-- ============================================
+-- GET /metrics/summary accepts ?platform= but metrics_summary (006) had
+-- no way to apply it. Adding a parameter changes the signature, so the
+-- old overload is dropped first.
+DROP FUNCTION IF EXISTS metrics_summary(UUID, DATE, DATE, UUID);
+
+CREATE OR REPLACE FUNCTION metrics_summary(
+    p_org UUID,
+    p_from DATE,
+    p_to DATE,
+    p_account UUID DEFAULT NULL,
+    p_platform TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    impressions BIGINT,
+    clicks BIGINT,
+    spend NUMERIC,
+    conversions NUMERIC,
+    conversion_value NUMERIC,
+    accounts_count BIGINT,
+    campaigns_count BIGINT
+) AS $$
+    SELECT
+        COALESCE(SUM(dm.impressions), 0)::BIGINT,
+        COALESCE(SUM(dm.clicks), 0)::BIGINT,
+        COALESCE(SUM(dm.spend), 0),
+        COALESCE(SUM(dm.conversions), 0),
+        COALESCE(SUM(dm.conversion_value), 0),
+        COUNT(DISTINCT dm.account_id),
+        COUNT(DISTINCT dm.entity_id)
+    FROM daily_metrics dm
+    JOIN connected_accounts ca ON ca.id = dm.account_id
+    WHERE ca.org_id = p_org
+      AND ca.is_active = TRUE
+      AND dm.date BETWEEN p_from AND p_to
+      AND (p_account IS NULL OR dm.account_id = p_account)
+      AND (p_platform IS NULL
+           OR COALESCE(dm.platform::TEXT, ca.platform::TEXT) = p_platform);
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,20 @@
+-- Ad Platform MVP - Daily Metrics Clustering
+-- Version: 1.0.8
+-- Date: 2026-10-15
+
+-- ============================================
+-- DAILY METRICS PHYSICAL ORDER
+-- ============================================
+-- daily_metrics has no org_id column; every metrics query filters by the
+-- org's account_ids and a date range, which idx_daily_metrics_account_date_covering
+-- (008) already serves as an index range scan. Rewriting the heap in that
+-- order keeps each account's days on adjacent pages, so the range scan
+-- (and heap visits for rows not yet all-visible) touch far fewer pages.
+--
+-- CLUSTER takes an ACCESS EXCLUSIVE lock and rewrites the table: run this
+-- off-hours. New rows are not kept in order, so re-run it periodically
+-- (e.g. monthly); the clustering index is remembered, so a bare
+-- `CLUSTER daily_metrics;` is enough afterwards.
+CLUSTER daily_metrics USING idx_daily_metrics_account_date_covering;
+
+ANALYZE daily_metrics;
@@ -54,13 +54,6 @@ interface DailyMetric {
     conversions: number;
 }
 
-interface MetricsTrend {
-    date_from: string;
-    date_to: string;
-    data: DailyMetric[];
-    summary: MetricsSummary;
-}
-
 interface PlatformMetric {
     platform: string;
     impressions: number;
@@ -71,11 +64,12 @@ interface PlatformMetric {
     campaigns_count: number;
 }
 
-interface MetricsByPlatform {
+interface MetricsDashboard {
     date_from: string;
     date_to: string;
+    summary: MetricsSummary;
+    daily: DailyMetric[];
     platforms: PlatformMetric[];
-    total: MetricsSummary;
 }
 
 export default function DashboardPage() {
@@ -127,42 +121,20 @@ export default function DashboardPage() {
                 setAccounts([]);
             }
 
-            // Fetch metrics summary (with optional account filter)
+            // Fetch summary, daily trend and platform breakdown in one request
             try {
-                let metricsUrl = `/api/v1/metrics/summary?date_from=${dateFromStr}&date_to=${dateToStr}`;
+                let dashboardUrl = `/api/v1/metrics/dashboard?date_from=${dateFromStr}&date_to=${dateToStr}`;
                 if (selectedAccountId !== "all") {
-                    metricsUrl += `&account_id=${selectedAccountId}`;
+                    dashboardUrl += `&account_id=${selectedAccountId}`;
                 }
-                const metricsRes = await api.get<MetricsSummary>(metricsUrl);
-                setMetrics(metricsRes.data);
+                const dashboardRes = await api.get<MetricsDashboard>(dashboardUrl);
+                setMetrics(dashboardRes.data.summary);
+                setDailyData(dashboardRes.data.daily || []);
+                setPlatformData(dashboardRes.data.platforms || []);
             } catch (err) {
                 console.log("No metrics:", err);
                 setMetrics(null);
-            }
-
-            // Fetch daily metrics for chart (with optional account filter)
-            try {
-                let dailyUrl = `/api/v1/metrics/daily?date_from=${dateFromStr}&date_to=${dateToStr}`;
-                if (selectedAccountId !== "all") {
-                    dailyUrl += `&account_id=${selectedAccountId}`;
-                }
-                const dailyRes = await api.get<MetricsTrend>(dailyUrl);
-                setDailyData(dailyRes.data.data || []);
-            } catch (err) {
-                console.log("No daily metrics:", err);
                 setDailyData([]);
-            }
-
-            // Fetch platform breakdown (with optional account filter)
-            try {
-                let platformUrl = `/api/v1/metrics/by-platform?date_from=${dateFromStr}&date_to=${dateToStr}`;
-                if (selectedAccountId !== "all") {
-                    platformUrl += `&account_id=${selectedAccountId}`;
-                }
-                const platformRes = await api.get<MetricsByPlatform>(platformUrl);
-                setPlatformData(platformRes.data.platforms || []);
-            } catch (err) {
-                console.log("No platform metrics:", err);
                 setPlatformData([]);
             }
 
@@ -123,6 +123,15 @@ export const api = {
             const searchParams = new URLSearchParams(params as Record<string, string>);
             return apiClient.get(`/api/v1/metrics/by-platform?${searchParams}`);
         },
+        dashboard: (params?: {
+            preset?: string;
+            date_from?: string;
+            date_to?: string;
+            account_id?: string;
+        }) => {
+            const searchParams = new URLSearchParams(params as Record<string, string>);
+            return apiClient.get(`/api/v1/metrics/dashboard?${searchParams}`);
+        },
     },
 
     // Insights